@@ -0,0 +1,105 @@
+"""add stats tables
+
+Revision ID: 8211ca705eb0
+Revises: 2b1a1c3a2903
+Create Date: 2026-10-18 16:34:06.118412
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8211ca705eb0"
+down_revision: Union[str, None] = "2b1a1c3a2903"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+alignment = postgresql.ENUM("EVIL", "GOOD", name="alignment", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "game_stats",
+        sa.Column("script_id", sa.Integer(), nullable=False),
+        sa.Column("player_count", sa.Integer(), nullable=False),
+        sa.Column("is_in_person", sa.Boolean(), nullable=False),
+        sa.Column("winning_team", alignment, nullable=False),
+        sa.Column("games", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["script_id"], ["scripts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "script_id", "player_count", "is_in_person", "winning_team"
+        ),
+    )
+    op.create_table(
+        "role_stats",
+        sa.Column("role_id", sa.Integer(), nullable=False),
+        sa.Column("script_id", sa.Integer(), nullable=False),
+        sa.Column("player_count", sa.Integer(), nullable=False),
+        sa.Column("is_in_person", sa.Boolean(), nullable=False),
+        sa.Column("winning_team", alignment, nullable=False),
+        sa.Column("games", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["role_id"], ["roles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["script_id"], ["scripts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "role_id", "script_id", "player_count", "is_in_person", "winning_team"
+        ),
+    )
+    op.create_table(
+        "drunk_stats",
+        sa.Column("role_id", sa.Integer(), nullable=False),
+        sa.Column("script_id", sa.Integer(), nullable=False),
+        sa.Column("player_count", sa.Integer(), nullable=False),
+        sa.Column("is_in_person", sa.Boolean(), nullable=False),
+        sa.Column("games", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["role_id"], ["roles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["script_id"], ["scripts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("role_id", "script_id", "player_count", "is_in_person"),
+    )
+    # count the existing games
+    op.execute(
+        """
+        INSERT INTO game_stats
+            (script_id, player_count, is_in_person, winning_team, games)
+        SELECT script_id, player_count, is_in_person, winning_team, COUNT(*)
+        FROM games
+        GROUP BY script_id, player_count, is_in_person, winning_team
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO role_stats
+            (role_id, script_id, player_count, is_in_person, winning_team, games)
+        SELECT gr.role_id, g.script_id, g.player_count, g.is_in_person,
+            g.winning_team, COUNT(*)
+        FROM games_roles gr JOIN games g ON gr.game_id = g.id
+        GROUP BY gr.role_id, g.script_id, g.player_count, g.is_in_person,
+            g.winning_team
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO drunk_stats
+            (role_id, script_id, player_count, is_in_person, games)
+        SELECT drunk_saw_role_id, script_id, player_count, is_in_person, COUNT(*)
+        FROM games
+        WHERE drunk_saw_role_id IS NOT NULL
+        GROUP BY drunk_saw_role_id, script_id, player_count, is_in_person
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("drunk_stats")
+    op.drop_table("role_stats")
+    op.drop_table("game_stats")
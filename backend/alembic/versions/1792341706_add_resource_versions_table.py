@@ -0,0 +1,35 @@
+"""add resource versions table
+
+Revision ID: f81e7dd7a8ac
+Revises: 8211ca705eb0
+Create Date: 2026-10-18 16:41:46.530187
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f81e7dd7a8ac"
+down_revision: Union[str, None] = "8211ca705eb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "resource_versions",
+        sa.Column("resource", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("modified_at", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("resource"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("resource_versions")
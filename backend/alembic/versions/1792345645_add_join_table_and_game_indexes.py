@@ -0,0 +1,132 @@
+"""add join table and game indexes
+
+Revision ID: 3c9e5b2d7f14
+Revises: f81e7dd7a8ac
+Create Date: 2026-10-18 17:47:25.000000
+
+The indexes are built concurrently, outside of the migration's transaction, so
+that the tables stay writable while they are built. Duplicate role mappings are
+deleted first, since the unique indexes cannot be built over them. The role
+statistics counted them, so they are recounted in the same transaction, and the
+versions of the resources whose responses changed are bumped. A build that fails
+leaves an invalid index, which is dropped when the migration is run again.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e5b2d7f14"
+down_revision: Union[str, None] = "f81e7dd7a8ac"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# unique indexes, turned into the unique constraints of the models
+CONSTRAINTS = (
+    ("games_roles_game_id_role_id_key", "games_roles", ["game_id", "role_id"]),
+    ("scripts_roles_script_id_role_id_key", "scripts_roles", ["script_id", "role_id"]),
+)
+INDEXES = (
+    ("ix_games_roles_role_id", "games_roles", ["role_id"]),
+    ("ix_scripts_roles_role_id", "scripts_roles", ["role_id"]),
+    ("ix_games_date_id", "games", ["date", "id"]),
+    ("ix_games_script_id_date_id", "games", ["script_id", "date", "id"]),
+    ("ix_games_drunk_saw_role_id", "games", ["drunk_saw_role_id"]),
+)
+# the resource whose version is bumped when duplicates of a table are deleted
+RESOURCES = {"games_roles": "games", "scripts_roles": "scripts"}
+
+
+def recount_role_stats() -> None:
+    """Recount the role counters from the games, as `flask stats rebuild` does."""
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("LOCK TABLE role_stats IN EXCLUSIVE MODE")
+    op.execute("DELETE FROM role_stats")
+    op.execute(
+        """
+        INSERT INTO role_stats
+            (role_id, script_id, player_count, is_in_person, winning_team, games)
+        SELECT gr.role_id, g.script_id, g.player_count, g.is_in_person,
+            g.winning_team, COUNT(*)
+        FROM games_roles gr JOIN games g ON gr.game_id = g.id
+        GROUP BY gr.role_id, g.script_id, g.player_count, g.is_in_person,
+            g.winning_team
+        """
+    )
+
+
+def bump_version(resource: str) -> None:
+    """Increment the version of a resource, so that cached responses are stale."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    op.execute(
+        sa.text(
+            "INSERT INTO resource_versions (resource, version, modified_at)"
+            " VALUES (:resource, 1, :modified_at)"
+            " ON CONFLICT (resource) DO UPDATE"
+            " SET version = resource_versions.version + 1,"
+            " modified_at = excluded.modified_at"
+        ).bindparams(
+            sa.bindparam("resource", resource),
+            sa.bindparam("modified_at", now, type_=sa.DateTime()),
+        )
+    )
+
+
+def upgrade() -> None:
+    context = op.get_context()
+    for _, table, columns in CONSTRAINTS:
+        delete_duplicates = sa.text(
+            f"DELETE FROM {table} WHERE id NOT IN"
+            f" (SELECT MIN(id) FROM {table} GROUP BY {', '.join(columns)})"
+        )
+        # offline, whether any rows are deleted is only known when the SQL is run
+        if context.as_sql:
+            op.execute(delete_duplicates)
+            removed = 1
+        else:
+            removed = op.get_bind().execute(delete_duplicates).rowcount
+            if removed:
+                logging.getLogger("alembic").warning(
+                    f"Deleted {removed} duplicate rows from {table}"
+                )
+        if not removed:
+            continue
+        if table == "games_roles":
+            recount_role_stats()
+        bump_version(RESOURCES[table])
+
+    with context.autocommit_block():
+        for name, table, columns, unique in [
+            *((*constraint, True) for constraint in CONSTRAINTS),
+            *((*index, False) for index in INDEXES),
+        ]:
+            # an interrupted concurrent build leaves an invalid index behind
+            op.drop_index(
+                name, table_name=table, if_exists=True, postgresql_concurrently=True
+            )
+            op.create_index(
+                name, table, columns, unique=unique, postgresql_concurrently=True
+            )
+
+    if context.dialect.name == "postgresql":
+        for name, table, _ in CONSTRAINTS:
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"
+            )
+
+
+def downgrade() -> None:
+    context = op.get_context()
+    with context.autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    for name, table, _ in reversed(CONSTRAINTS):
+        if context.dialect.name == "postgresql":
+            op.drop_constraint(name, table, type_="unique")
+        else:
+            op.drop_index(name, table_name=table)
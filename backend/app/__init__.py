@@ -1,4 +1,20 @@
-"""BotC Tracker backend."""
+"""BotC Tracker backend.
 
-from .app import create_app
-from .utils import logger
+The app factory is imported on first use, so that importing a submodule such as
+`app.models` or `app.config` does not pull in the web and API spec stack.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app import create_app
+
+
+def __getattr__(name: str) -> Any:
+    """Import the app factory lazily."""
+    if name == "create_app":
+        # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+        from .app import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
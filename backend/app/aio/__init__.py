@@ -0,0 +1,3 @@
+"""Async serving mode, requiring the optional async dependencies."""
+
+from .app import create_async_app
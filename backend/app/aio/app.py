@@ -0,0 +1,44 @@
+"""Async application entrypoint."""
+
+from typing import Any, Dict
+
+from quart import Quart
+
+from app import config
+from app.spec import build_spec
+from app.utils.json_provider import JSONProvider
+from app.utils.logger import configure_logging
+
+from .database import AsyncDatabase
+from .middleware import log_request, start_request_timing
+from .routes import create_router
+
+
+def serve_spec(app: Quart) -> None:
+    """Serve the API spec, built from the docstrings shared with the sync app."""
+    spec = build_spec(app).to_dict()
+
+    async def apispec() -> Dict[str, Any]:
+        return spec
+
+    app.route("/apispec.json", methods=["GET"])(apispec)
+
+
+def create_async_app() -> Quart:
+    """Async application factory.
+
+    Serves the game, role and script routes from an event loop, e.g. with
+    `hypercorn "app.aio:create_async_app()"`. The schemas, CRUD and OpenAPI spec
+    are shared with the sync app.
+    """
+    configure_logging()
+    app = Quart(__name__, static_folder=None)
+    app.json = JSONProvider(app)
+    app.config.from_object(config)
+    app.before_request(start_request_timing)
+    app.after_request(log_request)
+    app.register_blueprint(create_router())
+    serve_spec(app)
+    app.after_serving(AsyncDatabase.close_connection)
+    AsyncDatabase.establish_connection()
+    return app
@@ -0,0 +1,70 @@
+"""Async variants of the CRUD instances."""
+
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import (
+    BaseCRUD,
+    games_crud,
+    games_roles_crud,
+    roles_crud,
+    scripts_crud,
+    scripts_roles_crud,
+)
+from app.crud._base import LoaderStrategy
+from app.models import Game, GamesRoles, ModelBase, Role, Script, ScriptsRoles
+
+T = TypeVar("T", bound=ModelBase)
+R = TypeVar("R")
+
+
+class AsyncBaseCRUD(Generic[T]):
+    """Async variant of a BaseCRUD instance.
+
+    The wrapped CRUD runs unchanged on the sync facade of an AsyncSession, in a
+    greenlet whose database I/O is awaited on the event loop. Queries, catalog
+    lookups, statistics deltas and version bumps are therefore shared with the
+    sync app, while a request waiting on Postgres no longer holds a worker.
+    """
+
+    def __init__(self, crud: BaseCRUD[T]):
+        """Initialize with the sync CRUD instance to wrap."""
+        self.crud = crud
+
+    @staticmethod
+    async def run(
+        session: AsyncSession, method: Callable[..., R], *args: Any, **kwargs: Any
+    ) -> R:
+        """Run a sync CRUD method, which takes a Session first, on the session."""
+        return await session.run_sync(method, *args, **kwargs)
+
+    async def get_entities(
+        self,
+        session: AsyncSession,
+        loader: Optional[LoaderStrategy] = "selectin",
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Sequence[T]:
+        """Get entities in sort key order."""
+        return await self.run(session, self.crud.get_entities, loader, filters)
+
+    async def get_page(
+        self, session: AsyncSession, params: Dict[str, Any]
+    ) -> Tuple[Sequence[T], Optional[str]]:
+        """Get a page of entities and the cursor of the next page."""
+        return await self.run(session, self.crud.get_page, params)
+
+    async def get_entity(self, session: AsyncSession, id_: int) -> T:
+        """Get entity by id."""
+        return await self.run(session, self.crud.get_entity, id_)
+
+    async def delete_entity(self, session: AsyncSession, id_: int) -> None:
+        """Delete entity by id."""
+        await self.run(session, self.crud.delete_entity, id_)
+
+
+async_games_crud = AsyncBaseCRUD[Game](games_crud)
+async_games_roles_crud = AsyncBaseCRUD[GamesRoles](games_roles_crud)
+async_roles_crud = AsyncBaseCRUD[Role](roles_crud)
+async_scripts_crud = AsyncBaseCRUD[Script](scripts_crud)
+async_scripts_roles_crud = AsyncBaseCRUD[ScriptsRoles](scripts_roles_crud)
@@ -0,0 +1,44 @@
+"""Establish async database connection."""
+
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app import config
+from app.database import build_connection_string
+
+
+class AsyncDatabase:
+    """Async database static class."""
+
+    engine: Optional[AsyncEngine] = None
+
+    @classmethod
+    def establish_connection(cls) -> None:
+        """Create async database connection with the same pool settings."""
+        cls.engine = create_async_engine(
+            build_connection_string("postgresql+asyncpg"),
+            pool_size=config.POOL_SIZE,
+            max_overflow=config.POOL_MAX_OVERFLOW,
+            pool_timeout=config.POOL_TIMEOUT,
+            pool_recycle=config.POOL_RECYCLE,
+            pool_pre_ping=config.POOL_PRE_PING,
+            pool_use_lifo=config.POOL_USE_LIFO,
+        )
+
+    @classmethod
+    async def close_connection(cls) -> None:
+        """Close all pooled connections."""
+        if cls.engine is not None:
+            await cls.engine.dispose()
+
+
+@asynccontextmanager
+async def generate_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Generate async database session, not expiring entities on commit."""
+    session = AsyncSession(AsyncDatabase.engine, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
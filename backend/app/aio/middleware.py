@@ -0,0 +1,29 @@
+"""Async request logging middleware."""
+
+import logging
+
+from quart import Response, request
+
+from app.config import REQUEST_IP_HEADER, SERVER_TIMING
+from app.utils.timing import current_timings, start_timings
+
+
+async def start_request_timing() -> None:
+    """Start timing the request."""
+    rule = request.url_rule.rule if request.url_rule else request.path
+    start_timings(f"{request.method} {rule}")
+
+
+async def log_request(response: Response) -> Response:
+    """Log request info, with its duration, database time and response size."""
+    timings = current_timings.get()
+    if timings is None:
+        return response
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = timings.server_timing()
+    timings.size = response.content_length or 0
+    logging.info(
+        f"{request.headers.get(REQUEST_IP_HEADER)} - {request.method} {request.path}"
+        f" - {response.status_code} - {timings.summary()}"
+    )
+    return response
@@ -0,0 +1,44 @@
+"""Share OpenAPI documentation between sync and async routes."""
+
+from typing import Any, Callable, Dict, TypeVar
+
+from apispec.yaml_utils import dict_to_yaml, load_yaml_from_docstring
+
+from app.routes._streaming import NDJSON_MIMETYPE
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# documented on the sync routes, which are the only ones streaming listings
+SYNC_ONLY_PARAMETERS = ("stream",)
+SYNC_ONLY_CONTENT = (NDJSON_MIMETYPE,)
+
+
+def without_sync_only(operations: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the parameters and response content only the sync routes serve."""
+    for operation in operations.values():
+        if "parameters" in operation:
+            operation["parameters"] = [
+                parameter
+                for parameter in operation["parameters"]
+                if parameter.get("name") not in SYNC_ONLY_PARAMETERS
+            ]
+        for response in operation.get("responses", {}).values():
+            for mimetype in SYNC_ONLY_CONTENT:
+                response.get("content", {}).pop(mimetype, None)
+    return operations
+
+
+def documented_by(view: Callable[..., Any]) -> Callable[[F], F]:
+    """Document an async route with the docstring of its sync counterpart.
+
+    Both apps then build their OpenAPI operations from one source, but what only
+    the sync route serves, like NDJSON streaming, is left out.
+    """
+    summary = (view.__doc__ or "").split("---")[0].strip()
+    operations = without_sync_only(load_yaml_from_docstring(view.__doc__ or ""))
+
+    def decorator(route: F) -> F:
+        route.__doc__ = f"{summary}\n\n---\n{dict_to_yaml(operations)}"
+        return route
+
+    return decorator
@@ -0,0 +1,191 @@
+"""Async game routes."""
+
+from typing import Any, Tuple
+
+from marshmallow import ValidationError
+from quart import Blueprint, jsonify, request
+
+from app.aio.crud import async_games_crud, async_games_roles_crud
+from app.aio.database import generate_async_session
+from app.crud import games_crud, games_roles_crud
+from app.exceptions import BotCIntegrityError, BotCNotFoundError
+from app.routes import games
+from app.schemas import (
+    GamePageSchema,
+    GameSchema,
+    GamesRolesSchema,
+    RoleSchema,
+    compile_dump,
+)
+from app.utils.timing import timed_serialization
+
+from ._documented import documented_by
+
+schema = GameSchema()
+dump = compile_dump(schema)
+page_schema = GamePageSchema()
+role_schema = RoleSchema()
+games_roles_schema = GamesRolesSchema()
+
+
+@documented_by(games.list_games)
+async def list_games() -> Tuple[Any, int]:
+    """List games route."""
+    try:
+        params = page_schema.load(request.args)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_games, next_cursor = await async_games_crud.get_page(session, params)
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        with timed_serialization():
+            dumped = [dump(game) for game in raw_games]
+        result = {"result": dumped, "nextCursor": next_cursor}
+    return jsonify(result), 200
+
+
+@documented_by(games.create_game)
+async def create_game() -> Tuple[Any, int]:
+    """Create game route."""
+    try:
+        data = schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_game = await async_games_crud.run(
+                session, games_crud.create_entity, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_game)
+    return jsonify(result), 201
+
+
+@documented_by(games.create_game_bulk)
+async def create_game_bulk() -> Tuple[Any, int]:
+    """Create multiple games route."""
+    try:
+        data = schema.load(await request.get_json(), many=True)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_games = await async_games_crud.run(
+                session, games_crud.create_entities, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_games, many=True)
+    return jsonify({"result": result}), 201
+
+
+@documented_by(games.get_game)
+async def get_game(game_id: str) -> Tuple[Any, int]:
+    """Get game by id route."""
+    async with generate_async_session() as session:
+        try:
+            raw_game = await async_games_crud.get_entity(session, int(game_id))
+        except BotCIntegrityError:
+            return "Resource not found", 404
+        result = dump(raw_game)
+    return jsonify(result), 200
+
+
+@documented_by(games.update_game)
+async def update_game(game_id: str) -> Tuple[Any, int]:
+    """Update game route."""
+    try:
+        data = schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_game = await async_games_crud.run(
+                session, games_crud.update_entity, data, int(game_id)
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_game)
+    return jsonify(result), 200
+
+
+@documented_by(games.delete_game)
+async def delete_game(game_id: str) -> Tuple[Any, int]:
+    """Delete game route."""
+    async with generate_async_session() as session:
+        await async_games_crud.delete_entity(session, int(game_id))
+    return "", 204
+
+
+@documented_by(games.create_games_roles)
+async def create_games_roles() -> Tuple[Any, int]:
+    """Create role mapping for game route."""
+    try:
+        data = games_roles_schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_games_roles = await async_games_roles_crud.run(
+                session, games_roles_crud.create_entity, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_games_roles)
+    return jsonify(result), 201
+
+
+@documented_by(games.create_games_roles_bulk)
+async def create_games_roles_bulk() -> Tuple[Any, int]:
+    """Create role mappings for multiple games route."""
+    try:
+        data = games_roles_schema.load(await request.get_json(), many=True)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_games_roles = await async_games_roles_crud.run(
+                session, games_roles_crud.create_entities, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_games_roles, many=True)
+    return jsonify({"result": result}), 201
+
+
+@documented_by(games.set_game_roles)
+async def set_game_roles(game_id: str) -> Tuple[Any, int]:
+    """Set roles for game route."""
+    try:
+        data = role_schema.load(await request.get_json(), many=True)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_game = await async_games_roles_crud.run(
+                session, games_roles_crud.create_entities_for_game, data, int(game_id)
+            )
+        except BotCNotFoundError:
+            return "Resource not found", 404
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_game)
+    return jsonify(result), 200
+
+
+def create_router() -> Blueprint:
+    """Router factory."""
+    router = Blueprint("games", __name__, url_prefix="/games")
+    router.route("", methods=["GET"])(list_games)
+    router.route("", methods=["POST"])(create_game)
+    router.route("/bulk", methods=["POST"])(create_game_bulk)
+    router.route("/roles", methods=["POST"])(create_games_roles)
+    router.route("/roles/bulk", methods=["POST"])(create_games_roles_bulk)
+    router.route("/<game_id>", methods=["GET"])(get_game)
+    router.route("/<game_id>", methods=["PUT"])(update_game)
+    router.route("/<game_id>", methods=["DELETE"])(delete_game)
+    router.route("/<game_id>/roles", methods=["POST"])(set_game_roles)
+    return router
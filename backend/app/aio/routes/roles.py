@@ -0,0 +1,124 @@
+"""Async role routes."""
+
+from typing import Any, Tuple
+
+from marshmallow import ValidationError
+from quart import Blueprint, jsonify, request
+
+from app.aio.crud import async_roles_crud
+from app.aio.database import generate_async_session
+from app.crud import roles_crud
+from app.exceptions import BotCIntegrityError
+from app.routes import roles
+from app.schemas import PageSchema, RoleSchema, compile_dump
+from app.utils.timing import timed_serialization
+
+from ._documented import documented_by
+
+schema = RoleSchema()
+dump = compile_dump(schema)
+page_schema = PageSchema()
+
+
+@documented_by(roles.list_roles)
+async def list_roles() -> Tuple[Any, int]:
+    """List roles route."""
+    try:
+        params = page_schema.load(request.args)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_roles, next_cursor = await async_roles_crud.get_page(session, params)
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        with timed_serialization():
+            dumped = [dump(role) for role in raw_roles]
+        result = {"result": dumped, "nextCursor": next_cursor}
+    return jsonify(result), 200
+
+
+@documented_by(roles.create_role)
+async def create_role() -> Tuple[Any, int]:
+    """Create role route."""
+    try:
+        data = schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_role = await async_roles_crud.run(
+                session, roles_crud.create_entity, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_role)
+    return jsonify(result), 201
+
+
+@documented_by(roles.create_role_bulk)
+async def create_role_bulk() -> Tuple[Any, int]:
+    """Create multiple roles route."""
+    try:
+        data = schema.load(await request.get_json(), many=True)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_roles = await async_roles_crud.run(
+                session, roles_crud.create_entities, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_roles, many=True)
+    return jsonify({"result": result}), 201
+
+
+@documented_by(roles.get_role)
+async def get_role(role_id: str) -> Tuple[Any, int]:
+    """Get role by id route."""
+    async with generate_async_session() as session:
+        try:
+            raw_role = await async_roles_crud.get_entity(session, int(role_id))
+        except BotCIntegrityError:
+            return "Resource not found", 404
+        result = dump(raw_role)
+    return jsonify(result), 200
+
+
+@documented_by(roles.update_role)
+async def update_role(role_id: str) -> Tuple[Any, int]:
+    """Update role route."""
+    try:
+        data = schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_role = await async_roles_crud.run(
+                session, roles_crud.update_entity, data, int(role_id)
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_role)
+    return jsonify(result), 200
+
+
+@documented_by(roles.delete_role)
+async def delete_role(role_id: str) -> Tuple[Any, int]:
+    """Delete role route."""
+    async with generate_async_session() as session:
+        await async_roles_crud.delete_entity(session, int(role_id))
+    return "", 204
+
+
+def create_router() -> Blueprint:
+    """Router factory."""
+    router = Blueprint("roles", __name__, url_prefix="/roles")
+    router.route("", methods=["GET"])(list_roles)
+    router.route("", methods=["POST"])(create_role)
+    router.route("/bulk", methods=["POST"])(create_role_bulk)
+    router.route("/<role_id>", methods=["GET"])(get_role)
+    router.route("/<role_id>", methods=["PUT"])(update_role)
+    router.route("/<role_id>", methods=["DELETE"])(delete_role)
+    return router
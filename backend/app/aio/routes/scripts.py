@@ -0,0 +1,198 @@
+"""Async script routes."""
+
+from typing import Any, Tuple
+
+from marshmallow import ValidationError
+from quart import Blueprint, jsonify, request
+
+from app.aio.crud import async_scripts_crud, async_scripts_roles_crud
+from app.aio.database import generate_async_session
+from app.crud import scripts_crud, scripts_roles_crud
+from app.exceptions import BotCIntegrityError
+from app.routes import scripts
+from app.schemas import (
+    PageSchema,
+    RoleSchema,
+    ScriptSchema,
+    ScriptsRolesSchema,
+    compile_dump,
+)
+from app.utils.timing import timed_serialization
+
+from ._documented import documented_by
+
+schema = ScriptSchema()
+dump = compile_dump(schema)
+page_schema = PageSchema()
+role_schema = RoleSchema()
+scripts_roles_schema = ScriptsRolesSchema()
+
+
+@documented_by(scripts.list_scripts)
+async def list_scripts() -> Tuple[Any, int]:
+    """List scripts route."""
+    try:
+        params = page_schema.load(request.args)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_scripts, next_cursor = await async_scripts_crud.get_page(
+                session, params
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        with timed_serialization():
+            dumped = [dump(script) for script in raw_scripts]
+        result = {"result": dumped, "nextCursor": next_cursor}
+    return jsonify(result), 200
+
+
+@documented_by(scripts.create_script)
+async def create_script() -> Tuple[Any, int]:
+    """Create script route."""
+    try:
+        data = schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_script = await async_scripts_crud.run(
+                session, scripts_crud.create_entity, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_script)
+    return jsonify(result), 201
+
+
+@documented_by(scripts.create_script_bulk)
+async def create_script_bulk() -> Tuple[Any, int]:
+    """Create multiple scripts route."""
+    try:
+        data = schema.load(await request.get_json(), many=True)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_scripts = await async_scripts_crud.run(
+                session, scripts_crud.create_entities, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_scripts, many=True)
+    return jsonify({"result": result}), 201
+
+
+@documented_by(scripts.get_script)
+async def get_script(script_id: str) -> Tuple[Any, int]:
+    """Get script by id route."""
+    async with generate_async_session() as session:
+        try:
+            raw_script = await async_scripts_crud.get_entity(session, int(script_id))
+        except BotCIntegrityError:
+            return "Resource not found", 404
+        result = dump(raw_script)
+    return jsonify(result), 200
+
+
+@documented_by(scripts.update_script)
+async def update_script(script_id: str) -> Tuple[Any, int]:
+    """Update script route."""
+    try:
+        data = schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_script = await async_scripts_crud.run(
+                session, scripts_crud.update_entity, data, int(script_id)
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_script)
+    return jsonify(result), 200
+
+
+@documented_by(scripts.delete_script)
+async def delete_script(script_id: str) -> Tuple[Any, int]:
+    """Delete script route."""
+    async with generate_async_session() as session:
+        await async_scripts_crud.delete_entity(session, int(script_id))
+    return "", 204
+
+
+@documented_by(scripts.create_scripts_roles)
+async def create_scripts_roles() -> Tuple[Any, int]:
+    """Create role mapping for script route."""
+    try:
+        data = scripts_roles_schema.load(await request.get_json())
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_scripts_roles = await async_scripts_roles_crud.run(
+                session, scripts_roles_crud.create_entity, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_scripts_roles)
+    return jsonify(result), 201
+
+
+@documented_by(scripts.create_scripts_roles_bulk)
+async def create_scripts_roles_bulk() -> Tuple[Any, int]:
+    """Create role mappings for multiple scripts route."""
+    try:
+        data = scripts_roles_schema.load(await request.get_json(), many=True)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_scripts_roles = await async_scripts_roles_crud.run(
+                session, scripts_roles_crud.create_entities, data
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_scripts_roles, many=True)
+    return jsonify({"result": result}), 201
+
+
+@documented_by(scripts.set_script_roles)
+async def set_script_roles(script_id: str) -> Tuple[Any, int]:
+    """Set roles for script route."""
+    try:
+        data = role_schema.load(await request.get_json(), many=True)
+    except ValidationError as err:
+        return err.messages, 400
+    async with generate_async_session() as session:
+        try:
+            raw_script = await async_scripts_crud.get_entity(session, int(script_id))
+        except BotCIntegrityError:
+            return "Resource not found", 404
+        try:
+            raw_script = await async_scripts_roles_crud.run(
+                session,
+                scripts_roles_crud.create_entities_for_script,
+                data,
+                raw_script.id,
+            )
+        except BotCIntegrityError as err:
+            return err.messages, 400
+        result = schema.dump(raw_script)
+    return jsonify(result), 200
+
+
+def create_router() -> Blueprint:
+    """Router factory."""
+    router = Blueprint("scripts", __name__, url_prefix="/scripts")
+    router.route("", methods=["GET"])(list_scripts)
+    router.route("", methods=["POST"])(create_script)
+    router.route("/bulk", methods=["POST"])(create_script_bulk)
+    router.route("/roles", methods=["POST"])(create_scripts_roles)
+    router.route("/roles/bulk", methods=["POST"])(create_scripts_roles_bulk)
+    router.route("/<script_id>", methods=["GET"])(get_script)
+    router.route("/<script_id>", methods=["PUT"])(update_script)
+    router.route("/<script_id>", methods=["DELETE"])(delete_script)
+    router.route("/<script_id>/roles", methods=["POST"])(set_script_roles)
+    return router
@@ -1,20 +1,42 @@
 """Application entrypoint."""
 
 from flask import Flask
+from marshmallow import ValidationError
 
 from app import config
+from app.cli import create_commands
 from app.database import Database
-from app.middleware import log_request
+from app.exceptions import BotCIntegrityError
+from app.middleware import (
+    compress_response,
+    end_request_timing,
+    log_request,
+    record_metrics,
+    reject_request,
+    start_request_timing,
+)
 from app.routes import create_router
 from app.spec import serve_spec
+from app.utils.json_provider import JSONProvider
+from app.utils.logger import configure_logging
 
 
 def create_app() -> Flask:
     """Application factory."""
+    configure_logging()
     app = Flask(__name__)
+    app.json = JSONProvider(app)
     app.config.from_object(config)
-    app.before_request(log_request)
+    app.before_request(start_request_timing)
+    app.after_request(record_metrics)
+    app.after_request(log_request)
+    app.after_request(compress_response)
+    app.teardown_request(end_request_timing)
+    app.register_error_handler(BotCIntegrityError, reject_request)
+    app.register_error_handler(ValidationError, reject_request)
     app.register_blueprint(create_router())
     serve_spec(app)
+    for command in create_commands():
+        app.cli.add_command(command)
     Database.establish_connection()
     return app
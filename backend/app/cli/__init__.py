@@ -0,0 +1,14 @@
+"""Command line interface."""
+
+from typing import List
+
+from click import Command
+
+from .data import create_command as create_data_command
+from .spec import create_command as create_spec_command
+from .stats import create_command as create_stats_command
+
+
+def create_commands() -> List[Command]:
+    """Command factory."""
+    return [create_data_command(), create_spec_command(), create_stats_command()]
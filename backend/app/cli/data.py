@@ -0,0 +1,303 @@
+"""Synthetic data commands."""
+
+import itertools
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.crud import (
+    games_crud,
+    games_roles_crud,
+    roles_crud,
+    scripts_crud,
+    scripts_roles_crud,
+)
+from app.database import generate_session
+from app.exceptions import BotCIntegrityError
+from app.models import Alignment, Game, GamesRoles, Role, RoleType, Script
+
+Row = Dict[str, Any]
+
+DRUNK = "Drunk"
+TEAMS = (RoleType.TOWNSFOLK, RoleType.OUTSIDER, RoleType.MINION, RoleType.DEMON)
+POOL_SIZES = (40, 12, 16, 12)
+SCRIPT_SIZES = ((11, 13), (4, 4), (4, 4), (1, 4))
+
+# Townsfolk, outsiders, minions and demons in play for each player count
+SETUPS = {
+    5: (3, 0, 1, 1),
+    6: (3, 1, 1, 1),
+    7: (5, 0, 1, 1),
+    8: (5, 1, 1, 1),
+    9: (5, 2, 1, 1),
+    10: (7, 0, 2, 1),
+    11: (7, 1, 2, 1),
+    12: (7, 2, 2, 1),
+    13: (9, 0, 3, 1),
+    14: (9, 1, 3, 1),
+    15: (9, 2, 3, 1),
+}
+PLAYER_COUNTS = tuple(SETUPS)
+PLAYER_COUNT_WEIGHTS = (2, 3, 6, 8, 9, 10, 9, 8, 6, 4, 3)
+ALIGNMENTS = tuple(Alignment)
+FIRST_DATE = datetime(2020, 1, 1)
+DAYS = 5 * 365
+
+
+def role_pool() -> List[Row]:
+    """Build the rows of the roles scripts are drawn from, without ids."""
+    roles = [{"name": DRUNK, "team": RoleType.OUTSIDER}]
+    for team, size in zip(TEAMS, POOL_SIZES):
+        first = 2 if team == RoleType.OUTSIDER else 1
+        roles.extend(
+            {"name": f"{team.value.title()} {index}", "team": team}
+            for index in range(first, size + 1)
+        )
+    return roles
+
+
+class DatasetGenerator:
+    """Generates scripts and games that follow the rules of the game from a seed.
+
+    A script holds 11 to 13 townsfolk, 4 outsiders, 4 minions and 1 to 4 demons,
+    20 to 25 roles in all. A game plays the setup of its player count with roles
+    of its script, and when the Drunk is in play it saw a townsfolk of the script
+    that is not. Rows are loaded schema dicts with explicit ids, ready for the
+    bulk create paths.
+    """
+
+    def __init__(self, seed: int, roles: Sequence[Row]):
+        """Initialize with the seed and the role pool rows, with their ids."""
+        self.random = random.Random(seed)
+        self.pool = {
+            team: [role["id"] for role in roles if role["team"] == team]
+            for team in TEAMS
+        }
+        self.drunk_id = next(role["id"] for role in roles if role["name"] == DRUNK)
+        self.scripts: List[Tuple[int, List[List[int]]]] = []
+
+    def generate_scripts(
+        self, count: int, first_id: int, name: str
+    ) -> Tuple[List[Row], List[Row]]:
+        """Generate scripts, named after their id, and their role mappings."""
+        scripts: List[Row] = []
+        scripts_roles: List[Row] = []
+        for script_id in range(first_id, first_id + count):
+            script_roles = [
+                self.random.sample(self.pool[team], self.random.randint(*size))
+                for team, size in zip(TEAMS, SCRIPT_SIZES)
+            ]
+            if self.drunk_id not in script_roles[1] and self.random.random() < 0.5:
+                script_roles[1][0] = self.drunk_id
+            self.scripts.append((script_id, script_roles))
+            scripts.append({"id": script_id, "name": f"{name} {script_id}"})
+            scripts_roles.extend(
+                {"script_id": script_id, "role_id": role_id}
+                for role_ids in script_roles
+                for role_id in role_ids
+            )
+        return scripts, scripts_roles
+
+    def generate_game(self, game_id: int) -> Tuple[Row, List[int]]:
+        """Generate a game on one of the scripts and the ids of its roles."""
+        script_id, script_roles = self.random.choice(self.scripts)
+        player_count = self.random.choices(PLAYER_COUNTS, PLAYER_COUNT_WEIGHTS)[0]
+        in_play = [
+            self.random.sample(role_ids, amount)
+            for role_ids, amount in zip(script_roles, SETUPS[player_count])
+        ]
+        drunk_saw_role_id = None
+        if self.drunk_id in in_play[1]:
+            drunk_saw_role_id = self.random.choice(
+                [role_id for role_id in script_roles[0] if role_id not in in_play[0]]
+            )
+        game = {
+            "id": game_id,
+            "player_count": player_count,
+            "date": FIRST_DATE + timedelta(self.random.randrange(DAYS)),
+            "is_in_person": self.random.random() < 0.4,
+            "notes": None,
+            "winning_team": self.random.choice(ALIGNMENTS),
+            "script_id": script_id,
+            "drunk_saw_role_id": drunk_saw_role_id,
+        }
+        return game, [role_id for role_ids in in_play for role_id in role_ids]
+
+    def generate_games(
+        self, count: int, first_id: int, first_games_roles_id: int, chunk_size: int
+    ) -> Iterator[Tuple[List[Row], List[Row]]]:
+        """Generate games and their role mappings, a chunk at a time."""
+        games_roles_ids = itertools.count(first_games_roles_id)
+        end = first_id + count
+        for start in range(first_id, end, chunk_size):
+            games: List[Row] = []
+            games_roles: List[Row] = []
+            for game_id in range(start, min(start + chunk_size, end)):
+                game, role_ids = self.generate_game(game_id)
+                games.append(game)
+                games_roles.extend(
+                    {
+                        "id": next(games_roles_ids),
+                        "game_id": game_id,
+                        "role_id": role_id,
+                    }
+                    for role_id in role_ids
+                )
+            yield games, games_roles
+
+
+def next_id(session: Session, model: Any) -> int:
+    """Get the id following the largest one of a table."""
+    return (session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def resolve_roles(session: Session, roles: List[Row]) -> None:
+    """Set the ids of the pool roles, creating the ones not in database yet."""
+    ids = {
+        role.name: role.id
+        for role in session.scalars(
+            select(Role).where(Role.name.in_([role["name"] for role in roles]))
+        )
+    }
+    missing = [role for role in roles if role["name"] not in ids]
+    if missing:
+        created = roles_crud.create_entities(session, missing)
+        ids.update({role.name: role.id for role in created})
+    for role in roles:
+        role["id"] = ids[role["name"]]
+
+
+def insert_dataset(seed: int, scripts: int, games: int, chunk_size: int) -> None:
+    """Insert a dataset through the bulk create paths, reusing existing roles.
+
+    Every chunk of games is committed in its own session. Rows carry explicit
+    ids, so the bulk inserts use COPY when BULK_COPY is set.
+    """
+    roles = role_pool()
+    with generate_session() as session:
+        resolve_roles(session, roles)
+        generator = DatasetGenerator(seed, roles)
+        script_rows, scripts_roles = generator.generate_scripts(
+            scripts, next_id(session, Script), f"Synthetic {seed}"
+        )
+        scripts_crud.create_entities(session, script_rows)
+        scripts_roles_crud.create_entities(session, scripts_roles)
+        chunks = generator.generate_games(
+            games, next_id(session, Game), next_id(session, GamesRoles), chunk_size
+        )
+
+    for game_rows, games_roles in chunks:
+        with generate_session() as session:
+            games_crud.create_entities(session, game_rows)
+            games_roles_crud.create_entities(session, games_roles)
+
+
+def group_roles(
+    rows: List[Row], key: str, roles: Dict[int, Row]
+) -> Dict[int, List[Row]]:
+    """Group the dumped roles of mapping rows by the given id column."""
+    grouped: Dict[int, List[Row]] = {}
+    for row in rows:
+        grouped.setdefault(row[key], []).append(roles[row["role_id"]])
+    return grouped
+
+
+def dump_game(game: Row, roles: List[Row]) -> Row:
+    """Build a game as the API serializes it."""
+    return {
+        "id": game["id"],
+        "playerCount": game["player_count"],
+        "date": date.isoformat(game["date"]),
+        "isInPerson": game["is_in_person"],
+        "notes": game["notes"],
+        "winningTeam": game["winning_team"].value,
+        "scriptId": game["script_id"],
+        "roles": roles,
+        "drunkSawRoleId": game["drunk_saw_role_id"],
+    }
+
+
+def dump_scripts(
+    scripts: List[Row], scripts_roles: List[Row], roles: Dict[int, Row]
+) -> List[Row]:
+    """Build scripts as the API serializes them."""
+    script_roles = group_roles(scripts_roles, "script_id", roles)
+    return [{**script, "roles": script_roles[script["id"]]} for script in scripts]
+
+
+def write_dump(
+    file: IO[str], seed: int, scripts: int, games: int, chunk_size: int
+) -> None:
+    """Write a dataset in the format of the frontend's data recovery dumps.
+
+    Ids start at 1 and games are written as they are generated, so a dump of
+    any size is written in the memory of one chunk.
+    """
+    pool = [{**role, "id": index} for index, role in enumerate(role_pool(), 1)]
+    roles = {
+        role["id"]: {"id": role["id"], "name": role["name"], "team": role["team"].value}
+        for role in pool
+    }
+    generator = DatasetGenerator(seed, pool)
+    script_rows, scripts_roles = generator.generate_scripts(scripts, 1, "Synthetic")
+
+    file.write('{"games": [')
+    separator = ""
+    for game_rows, games_roles in generator.generate_games(games, 1, 1, chunk_size):
+        game_roles = group_roles(games_roles, "game_id", roles)
+        file.write(separator)
+        file.write(
+            ", ".join(
+                json.dumps(dump_game(game, game_roles[game["id"]]))
+                for game in game_rows
+            )
+        )
+        separator = ", "
+    file.write('], "roles": ')
+    json.dump(list(roles.values()), file)
+    file.write(', "scripts": ')
+    json.dump(dump_scripts(script_rows, scripts_roles, roles), file)
+    file.write("}\n")
+
+
+@click.option("--scripts", default=10, show_default=True, help="Scripts to create.")
+@click.option("--games", default=1000, show_default=True, help="Games to create.")
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+@click.option(
+    "--chunk-size", default=10_000, show_default=True, help="Games per bulk insert."
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w", encoding="utf-8"),
+    default=None,
+    help="Write a botc-dump JSON file instead of inserting.",
+)
+def generate(
+    scripts: int, games: int, seed: int, chunk_size: int, output: Optional[IO[str]]
+) -> None:
+    """Generate scripts and games consistent with their scripts."""
+    start = time.perf_counter()
+    if output is not None:
+        write_dump(output, seed, scripts, games, chunk_size)
+    else:
+        try:
+            insert_dataset(seed, scripts, games, chunk_size)
+        except BotCIntegrityError as err:
+            raise click.ClickException(str(err.messages)) from err
+    elapsed = time.perf_counter() - start
+    click.echo(f"Generated {scripts} scripts and {games} games in {elapsed:.1f}s")
+
+
+def create_command() -> AppGroup:
+    """Command factory."""
+    command = AppGroup("data", help="Generate synthetic data.")
+    command.command("generate")(generate)
+    return command
@@ -0,0 +1,37 @@
+"""API spec commands."""
+
+import json
+from typing import Optional
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.spec import generate_spec, load_spec
+
+
+@click.option("--output", "-o", default=None, help="Path to write, SPEC_FILE if unset.")
+def generate(output: Optional[str]) -> None:
+    """Write the API spec artifact served by the app."""
+    path = output or current_app.config["SPEC_FILE"]
+    spec = generate_spec(current_app)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(spec, file, indent=2, sort_keys=True)
+        file.write("\n")
+    click.echo(f"API spec written to {path}")
+
+
+def check() -> None:
+    """Check that the API spec artifact matches the routes and schemas."""
+    path = current_app.config["SPEC_FILE"]
+    if load_spec(current_app, path) is None:
+        raise click.ClickException(f"{path} is missing or out of date")
+    click.echo("API spec is up to date")
+
+
+def create_command() -> AppGroup:
+    """Command factory."""
+    command = AppGroup("spec", help="Maintain the API spec artifact.")
+    command.command("generate")(generate)
+    command.command("check")(check)
+    return command
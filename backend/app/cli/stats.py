@@ -0,0 +1,33 @@
+"""Statistics commands."""
+
+import click
+from flask.cli import AppGroup
+
+from app.crud import stats_crud
+from app.database import generate_session
+
+
+def rebuild() -> None:
+    """Recount the statistics tables from the games."""
+    with generate_session() as session:
+        stats_crud.rebuild(session)
+    click.echo("Statistics rebuilt")
+
+
+def check() -> None:
+    """Compare the statistics tables with a count from the games."""
+    with generate_session() as session:
+        mismatches = stats_crud.check(session)
+    for mismatch in mismatches:
+        click.echo(mismatch, err=True)
+    if mismatches:
+        raise click.ClickException(f"{len(mismatches)} statistics are out of date")
+    click.echo("Statistics are consistent")
+
+
+def create_command() -> AppGroup:
+    """Command factory."""
+    command = AppGroup("stats", help="Maintain the statistics tables.")
+    command.command("rebuild")(rebuild)
+    command.command("check")(check)
+    return command
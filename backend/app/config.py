@@ -13,4 +13,34 @@ SWAGGER = {
     "static_url_path": "/api/flasgger_static",
 }
 
+SPEC_FILE = os.environ.get(
+    "SPEC_FILE", os.path.join(os.path.dirname(__file__), "openapi.json")
+)
+
 REQUEST_IP_HEADER = os.environ.get("REQUEST_IP_HEADER", "X-Forwarded-For")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").lower() == "true"
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.environ.get("N_PLUS_ONE_THRESHOLD", "10"))
+N_PLUS_ONE_RAISE = os.environ.get("N_PLUS_ONE_RAISE", "false").lower() == "true"
+
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", "1000"))
+STREAM_BATCH_SIZE = int(os.environ.get("STREAM_BATCH_SIZE", "500"))
+
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", "5"))
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "256"))
+
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "auto")
+COMPILED_DUMPS = os.environ.get("COMPILED_DUMPS", "true").lower() == "true"
+
+BULK_CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE", "1000"))
+BULK_COPY = os.environ.get("BULK_COPY", "false").lower() == "true"
+
+POOL_SIZE = int(os.environ.get("POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.environ.get("POOL_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.environ.get("POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.environ.get("POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.environ.get("POOL_PRE_PING", "true").lower() == "true"
+POOL_USE_LIFO = os.environ.get("POOL_USE_LIFO", "true").lower() == "true"
@@ -1,7 +1,10 @@
 """Database function."""
 
+from ._base import BaseCRUD
 from .games import games_crud
 from .games_roles import games_roles_crud
-from .roles import roles_crud
+from .roles import role_catalog, roles_crud
 from .scripts import scripts_crud
 from .scripts_roles import scripts_roles_crud
+from .stats import StatsDelta, stats_crud
+from .versions import versions_crud
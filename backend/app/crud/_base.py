@@ -1,35 +1,429 @@
 """Base classes for model-based database operations."""
 
-from typing import Generic, Sequence, Type, TypeVar
+import base64
+import binascii
+import enum
+import io
+import json
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
-from sqlalchemy import delete, select
-from sqlalchemy.orm import Session
+import psycopg2
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Table,
+    delete,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, class_mapper, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql import Executable
 
-from app.exceptions import BotCIntegrityError
+from app.config import BULK_CHUNK_SIZE, BULK_COPY, STREAM_BATCH_SIZE
+from app.exceptions import BotCIntegrityError, BotCNotFoundError
 from app.models import ModelBase
 
+from .versions import versions_crud
+
 T = TypeVar("T", bound=ModelBase)
 
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+LoaderStrategy = Literal["selectin", "joined"]
+
+LOADERS: Dict[str, Callable[..., Any]] = {
+    "selectin": selectinload,
+    "joined": joinedload,
+}
+
+
+def copy_value(value: Any) -> str:
+    """Format a value as a field of a COPY ... WITH (FORMAT csv) row."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    if isinstance(value, (int, float)):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def is_violation(err: IntegrityError, sqlstate: str) -> bool:
+    """Check the SQLSTATE of an integrity error, whichever driver raised it."""
+    return getattr(err.orig, "pgcode", None) == sqlstate
+
+
+def without_null_id(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Leave a null id out of a row, so that the database assigns one."""
+    return {
+        key: value for key, value in row.items() if key != "id" or value is not None
+    }
+
 
 class BaseCRUD(Generic[T]):
     """Base class for CRUD methods."""
 
-    def __init__(self, model: Type[T]):
-        """Initialize with the given model."""
+    def __init__(
+        self,
+        model: Type[T],
+        eager_load: Sequence[Sequence[Any]] = (),
+        sort_keys: Sequence[Any] = (),
+        resources: Sequence[str] = (),
+    ):
+        """Initialize with the given model.
+
+        `eager_load` lists relationship paths, e.g. `(Game.roles, GamesRoles.role)`,
+        which are loaded alongside the entities when a loader strategy is used.
+        `sort_keys` are the columns listings are ordered and paginated by; they
+        must end with a unique column and default to the id. `resources` are the
+        collections whose version changes when an entity is deleted, including
+        through ON DELETE CASCADE.
+        """
         self.model = model
+        self.eager_load = eager_load
+        self.sort_keys = tuple(sort_keys) or (model.id,)
+        self.resources = resources
+
+    @property
+    def table(self) -> Table:
+        """Table the model is mapped to."""
+        return cast(Table, class_mapper(self.model).local_table)
+
+    def loader_options(self, loader: Optional[LoaderStrategy]) -> List[LoaderOption]:
+        """Build loader options for the eager load paths with the given strategy."""
+        if loader is None:
+            return []
+        options: List[LoaderOption] = []
+        for path in self.eager_load:
+            option = LOADERS[loader](path[0])
+            for attribute in path[1:]:
+                option = getattr(option, f"{loader}load")(attribute)
+            options.append(option)
+        return options
+
+    def _select(self, loader: Optional[LoaderStrategy]) -> Select:
+        """Build select statement for the model with loader options applied."""
+        return select(self.model).options(*self.loader_options(loader))
+
+    def prepare_session(self, session: Session) -> None:
+        """Prepare the session before loading entities, e.g. seed the identity map."""
+
+    def _list_select(
+        self,
+        loader: Optional[LoaderStrategy],
+        filters: Optional[Dict[str, Any]],
+        after: Optional[Tuple[Any, ...]],
+        limit: Optional[int],
+    ) -> Select:
+        """Build ordered listing statement with filters and keyset bounds applied."""
+        stmt = (
+            self._select(loader)
+            .where(*self.filter_clauses(filters or {}))
+            .order_by(*self.sort_keys)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(*self.sort_keys) > tuple_(*after))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def encode_cursor(self, entity: T) -> str:
+        """Encode the sort keys of an entity as an opaque pagination cursor."""
+        values = [getattr(entity, key.key) for key in self.sort_keys]
+        raw = json.dumps(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in values
+            ]
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> Tuple[Any, ...]:
+        """Decode a pagination cursor into sort key values."""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.sort_keys):
+                raise ValueError(cursor)
+            return tuple(
+                (
+                    datetime.fromisoformat(value)
+                    if key.type.python_type is datetime
+                    else key.type.python_type(value)
+                )
+                for key, value in zip(self.sort_keys, values)
+            )
+        except (binascii.Error, TypeError, ValueError) as err:
+            raise BotCIntegrityError("cursor", f"Invalid cursor: {cursor}") from err
+
+    # pylint: disable-next=unused-argument
+    def filter_clauses(self, filters: Dict[str, Any]) -> List[ColumnElement[bool]]:
+        """Build where clauses from the loaded filter schema."""
+        return []
+
+    def get_entities(
+        self,
+        session: Session,
+        loader: Optional[LoaderStrategy] = "selectin",
+        filters: Optional[Dict[str, Any]] = None,
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[T]:
+        """Get entities in sort key order.
+
+        Only entities matching the filters and sorting after the `after` key values
+        are returned, at most `limit` of them.
+        """
+        self.prepare_session(session)
+        result = session.scalars(self._list_select(loader, filters, after, limit))
+        if loader == "joined":
+            result = result.unique()
+        return result.all()
+
+    def stream_entities(
+        self,
+        session: Session,
+        filters: Optional[Dict[str, Any]] = None,
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[T]:
+        """Iterate entities in sort key order, fetching `batch_size` rows at a time.
+
+        Rows are read through a server-side cursor and each batch is expunged from
+        the session once consumed, so memory stays flat however many rows match.
+        """
+        self.prepare_session(session)
+        stmt = self._list_select("selectin", filters, after, limit)
+        result = session.scalars(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield from partition
+            # expunge_all() would swap out the identity map the open result uses
+            for loaded in list(session.identity_map.values()):
+                session.expunge(loaded)
+            self.prepare_session(session)
+
+    def get_page(
+        self,
+        session: Session,
+        params: Dict[str, Any],
+        loader: Optional[LoaderStrategy] = "selectin",
+    ) -> Tuple[Sequence[T], Optional[str]]:
+        """Get a page of entities from the loaded page schema.
+
+        Returns the entities and the cursor of the next page, if there is one.
+        """
+        after = self.decode_cursor(params["cursor"]) if params.get("cursor") else None
+        limit = params.get("limit")
+        entities = self.get_entities(
+            session,
+            loader,
+            filters=params,
+            after=after,
+            limit=limit + 1 if limit is not None else None,
+        )
+        if limit is None or len(entities) <= limit:
+            return entities, None
+        return entities[:limit], self.encode_cursor(entities[limit - 1])
+
+    def get_entity(
+        self,
+        session: Session,
+        id_: int,
+        loader: Optional[LoaderStrategy] = "selectin",
+        lock: bool = False,
+    ) -> T:
+        """Get entity by id.
+
+        With lock, its row is locked until the transaction ends and read again even
+        if the session already holds the entity.
+        """
+        self.prepare_session(session)
+        stmt = self._select(loader).where(self.model.id == id_)
+        if lock:
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
+        result = session.scalars(stmt)
+        if loader == "joined":
+            result = result.unique()
+        entity = result.first()
+        if entity is None:
+            raise BotCNotFoundError(f"{self.model.__name__} id", f"Invalid id: {id_}")
+        return entity
+
+    def insert_row(self, session: Session, row: Dict[str, Any]) -> T:
+        """Insert one row with INSERT ... RETURNING, without committing."""
+        values = without_null_id(row)
+        entity = session.scalars(
+            insert(self.model)
+            .returning(self.model)
+            .execution_options(render_nulls=True),
+            [values],
+        ).one()
+        for path in self.eager_load:
+            set_committed_value(entity, path[0].key, [])
+        if values.get("id") is not None:
+            self.reset_sequence(session)
+        return entity
+
+    def update_row(self, session: Session, id_: int, values: Dict[str, Any]) -> T:
+        """Update one row with UPDATE ... RETURNING, without committing.
+
+        The entity is returned with its eager load paths loaded.
+        """
+        self.prepare_session(session)
+        entity = session.scalar(
+            update(self.model)
+            .where(self.model.id == id_)
+            .values(**values)
+            .returning(self.model)
+            .options(*self.loader_options("selectin"))
+        )
+        if entity is None:
+            raise BotCNotFoundError(f"{self.model.__name__} id", f"Invalid id: {id_}")
+        return entity
+
+    def bulk_insert(self, session: Session, rows: Sequence[Dict[str, Any]]) -> List[T]:
+        """Insert rows without committing and return the new entities.
+
+        Rows are sent with INSERT ... RETURNING in chunks of BULK_CHUNK_SIZE, or with
+        COPY when that is possible, see can_copy.
+        """
+        if self.can_copy(session.get_bind(), rows):
+            entities = self._copy_insert(session, rows)
+        else:
+            entities = self._insert_chunks(session, rows)
+            for entity in entities:
+                for path in self.eager_load:
+                    set_committed_value(entity, path[0].key, [])
+        if any(row.get("id") is not None for row in rows):
+            self.reset_sequence(session)
+        return entities
+
+    def _insert_chunks(
+        self, session: Session, rows: Sequence[Dict[str, Any]]
+    ) -> List[T]:
+        """Insert rows with INSERT ... RETURNING, BULK_CHUNK_SIZE at a time.
+
+        Rows with and without ids go in separate chunks, and every row of a chunk
+        is sent with the same keys and its nulls rendered, so that each chunk is
+        a single multi-row statement. SQLite can only return rows in parameter
+        order one statement per row, so there the entities are put back in order
+        by id instead; it numbers new rows in the order they are given.
+        """
+        ordered = session.get_bind().dialect.name != "sqlite"
+        stmt = (
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=ordered)
+            .execution_options(render_nulls=True, bulk=True)
+        )
+        entities: List[Optional[T]] = [None] * len(rows)
+        for has_id in (True, False):
+            positions = [
+                index
+                for index, row in enumerate(rows)
+                if (row.get("id") is not None) == has_id
+            ]
+            keys = {key for index in positions for key in without_null_id(rows[index])}
+            for start in range(0, len(positions), BULK_CHUNK_SIZE):
+                chunk = positions[start : start + BULK_CHUNK_SIZE]
+                values = [
+                    {key: rows[index].get(key) for key in keys} for index in chunk
+                ]
+                inserted = self._insert_chunk(session, stmt, values, ordered)
+                for index, entity in zip(chunk, inserted):
+                    entities[index] = entity
+        return cast(List[T], entities)
+
+    def _insert_chunk(
+        self,
+        session: Session,
+        stmt: Executable,
+        values: List[Dict[str, Any]],
+        ordered: bool,
+    ) -> Sequence[T]:
+        """Insert a chunk of rows and get the new entities in the order of the rows."""
+        inserted = session.scalars(stmt, values).all()
+        if ordered:
+            return inserted
+        by_id = {entity.id: entity for entity in inserted}
+        if "id" in values[0]:
+            return [by_id[row["id"]] for row in values]
+        return [by_id[id_] for id_ in sorted(by_id)]
+
+    @staticmethod
+    def can_copy(
+        bind: Union[Engine, Connection], rows: Sequence[Dict[str, Any]]
+    ) -> bool:
+        """Check whether rows can be inserted with COPY.
+
+        That is when BULK_COPY is set and every row has an id, on Postgres through
+        psycopg2 only, since COPY goes through its cursor's copy_expert. The async
+        app reaches the same CRUD over asyncpg, whose cursor has no copy_expert.
+        """
+        return (
+            BULK_COPY
+            and bind.dialect.name == "postgresql"
+            and bind.dialect.driver == "psycopg2"
+            and all(row.get("id") is not None for row in rows)
+        )
 
-    def get_entities(self, session: Session) -> Sequence[T]:
-        """Get all entities."""
-        return session.scalars(select(self.model)).all()
+    def _copy_insert(self, session: Session, rows: Sequence[Dict[str, Any]]) -> List[T]:
+        """Insert rows with COPY and build the entities from the rows themselves."""
+        table = self.table
+        columns = [column.name for column in table.columns]
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(",".join(copy_value(row.get(name)) for name in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+        sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(sql, buffer)
+        except psycopg2.IntegrityError as err:
+            raise IntegrityError(sql, None, err) from err
+        finally:
+            cursor.close()
+        return [self.model(**row) for row in rows]
 
-    def get_entity(self, session: Session, id_: int) -> T:
-        """Get entity by id."""
-        result = session.scalars(select(self.model).where(self.model.id == id_)).first()
-        if result is None:
-            raise BotCIntegrityError(f"{self.model.__name__} id", f"Invalid id: {id_}")
-        return result
+    def reset_sequence(self, session: Session) -> None:
+        """Move the id sequence past rows inserted with explicit ids, on Postgres."""
+        if session.get_bind().dialect.name != "postgresql":
+            return
+        table = self.table.name
+        session.execute(
+            text(f"SELECT SETVAL('{table}_id_seq', (SELECT MAX(id) FROM {table}));")
+        )
 
     def delete_entity(self, session: Session, id_: int):
         """Delete entity by id."""
         session.execute(delete(self.model).where(self.model.id == id_))
+        versions_crud.bump(session, *self.resources)
         session.commit()
@@ -1,100 +1,145 @@
 """BaseCRUD extension and instance for Game model."""
 
 import logging
+from datetime import datetime, time, timedelta
 from typing import Any, Dict, List
 
-from sqlalchemy import text
+from sqlalchemy import ColumnElement
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.exceptions import BotCIntegrityError
 from app.models import Game
 
-from ._base import BaseCRUD
+from ._base import FOREIGN_KEY_VIOLATION, BaseCRUD, is_violation
+from .roles import role_catalog
+from .stats import StatsDelta, stats_crud
+from .versions import versions_crud
 
 
 class GamesCRUD(BaseCRUD[Game]):
     """BaseCRUD extension and instance for Game model."""
 
+    def prepare_session(self, session: Session) -> None:
+        """Attach the role catalog, so the roles of each game load from memory."""
+        role_catalog.attach(session)
+
+    def filter_clauses(self, filters: Dict[str, Any]) -> List[ColumnElement[bool]]:
+        """Build where clauses on games from the loaded filter schema."""
+        clauses = []
+        if filters.get("script_id") is not None:
+            clauses.append(Game.script_id == filters["script_id"])
+        if filters.get("winning_team") is not None:
+            clauses.append(Game.winning_team == filters["winning_team"])
+        if filters.get("is_in_person") is not None:
+            clauses.append(Game.is_in_person == filters["is_in_person"])
+        if filters.get("min_player_count") is not None:
+            clauses.append(Game.player_count >= filters["min_player_count"])
+        if filters.get("max_player_count") is not None:
+            clauses.append(Game.player_count <= filters["max_player_count"])
+        if filters.get("date_from") is not None:
+            clauses.append(Game.date >= datetime.combine(filters["date_from"], time()))
+        if filters.get("date_to") is not None:
+            day_after = filters["date_to"] + timedelta(days=1)
+            clauses.append(Game.date < datetime.combine(day_after, time()))
+        return clauses
+
     @staticmethod
-    def create_entity(session: Session, json: Dict[str, Any]) -> Game:
-        """Insert game in database."""
-        new_game = Game(
-            player_count=json["player_count"],
-            date=json["date"],
-            is_in_person=json["is_in_person"],
-            notes=json["notes"],
-            winning_team=json["winning_team"],
-            script_id=json["script_id"],
-            drunk_saw_role_id=json["drunk_saw_role_id"],
-            id=json.get("id", None),
-        )
+    def game_row(json: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a games row from the loaded game schema."""
+        return {
+            "player_count": json["player_count"],
+            "date": json["date"],
+            "is_in_person": json["is_in_person"],
+            "notes": json["notes"],
+            "winning_team": json["winning_team"],
+            "script_id": json["script_id"],
+            "drunk_saw_role_id": json["drunk_saw_role_id"],
+            "id": json.get("id"),
+        }
 
+    def create_entity(self, session: Session, json: Dict[str, Any]) -> Game:
+        """Insert game in database."""
         try:
-            session.add(new_game)
+            new_game = self.insert_row(session, self.game_row(json))
+            delta = StatsDelta()
+            delta.add_game(new_game, role_ids=[])
+            stats_crud.apply(session, delta)
+            versions_crud.bump(session, "games")
             session.commit()
-            session.refresh(new_game)
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("script_id", "not found") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_game
 
-    @staticmethod
-    def create_entities(session: Session, json: List[Dict[str, Any]]) -> List[Game]:
+    def create_entities(
+        self, session: Session, json: List[Dict[str, Any]]
+    ) -> List[Game]:
         """Insert multiple games in database."""
-        new_games = [
-            Game(
-                player_count=entry["player_count"],
-                date=entry["date"],
-                is_in_person=entry["is_in_person"],
-                notes=entry["notes"],
-                winning_team=entry["winning_team"],
-                script_id=entry["script_id"],
-                id=entry["id"],
-                drunk_saw_role_id=entry["drunk_saw_role_id"],
-            )
-            for entry in json
-        ]
-
         try:
-            session.add_all(new_games)
-            session.commit()
-            session.execute(
-                text("SELECT SETVAL('games_id_seq', (SELECT MAX(id) FROM games));")
+            new_games = self.bulk_insert(
+                session, [self.game_row(entry) for entry in json]
             )
+            delta = StatsDelta()
             for game in new_games:
-                session.refresh(game)
+                delta.add_game(game, role_ids=[])
+            stats_crud.apply(session, delta)
+            versions_crud.bump(session, "games")
+            session.commit()
         except IntegrityError as err:
-            if "psycopg2.errors.UniqueViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("script_id", "not found") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_games
 
     def update_entity(self, session: Session, json: Dict[str, Any], id_: int) -> Game:
-        """Update game in database."""
-        game: Game = self.get_entity(session, id_)
-        game.player_count = json["player_count"]
-        game.date = json["date"]
-        game.is_in_person = json["is_in_person"]
-        game.notes = json["notes"]
-        game.winning_team = json["winning_team"]
-        game.script_id = json["script_id"]
-        game.drunk_saw_role_id = json["drunk_saw_role_id"]
+        """Update game in database.
+
+        The game is read and locked first, since the statistics need its previous
+        values, so the update is flushed from it rather than sent with RETURNING.
+        """
+        game = self.get_entity(session, id_, lock=True)
+        delta = StatsDelta()
+        delta.add_game(game, -1)
+        for key, value in self.game_row(json).items():
+            if key != "id":
+                setattr(game, key, value)
+        delta.add_game(game)
 
         try:
-            session.add(game)
+            session.flush()
+            stats_crud.apply(session, delta)
+            versions_crud.bump(session, "games")
             session.commit()
-            session.refresh(game)
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("script_id", "not found") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
 
         return game
 
+    def delete_entity(self, session: Session, id_: int):
+        """Delete game by id, locking it while it is taken out of the statistics."""
+        game = session.scalars(
+            self._select("selectin")
+            .where(Game.id == id_)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).first()
+        if game is not None:
+            delta = StatsDelta()
+            delta.add_game(game, -1)
+            stats_crud.apply(session, delta)
+        super().delete_entity(session, id_)
+
 
-games_crud = GamesCRUD(Game)
+games_crud = GamesCRUD(
+    Game,
+    eager_load=((Game.roles,),),
+    sort_keys=(Game.date, Game.id),
+    resources=("games",),
+)
@@ -3,15 +3,18 @@
 import logging
 from typing import Any, Dict, List, Sequence
 
-from sqlalchemy import delete, select, text
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.exceptions import BotCIntegrityError
-from app.models import GamesRoles, Role
+from app.models import Game, GamesRoles
 
-from ._base import BaseCRUD
+from ._base import FOREIGN_KEY_VIOLATION, UNIQUE_VIOLATION, BaseCRUD, is_violation
+from .games import games_crud
 from .roles import roles_crud
+from .stats import StatsDelta, stats_crud
+from .versions import versions_crud
 
 
 class GamesRolesCRUD(BaseCRUD[GamesRoles]):
@@ -28,88 +31,134 @@ class GamesRolesCRUD(BaseCRUD[GamesRoles]):
             raise BotCIntegrityError("GamesRoles game_id", f"Invalid id: {game_id}")
         return result
 
-    @staticmethod
-    def create_entity(session: Session, json: Dict[str, Any]) -> GamesRoles:
+    def create_entity(self, session: Session, json: Dict[str, Any]) -> GamesRoles:
         """Insert game role mapping in database."""
-        new_games_roles = GamesRoles(
-            game_id=json["game_id"], role_id=json["role_id"], id=json.get("id", None)
+        row = {
+            "game_id": json["game_id"],
+            "role_id": json["role_id"],
+            "id": json.get("id"),
+        }
+        delta = StatsDelta()
+        game = session.get(
+            Game, json["game_id"], with_for_update=True, populate_existing=True
         )
+        if game is not None:
+            delta.add_roles(game, [json["role_id"]])
 
         try:
-            session.add(new_games_roles)
+            new_games_roles = self.insert_row(session, row)
+            stats_crud.apply(session, delta)
+            versions_crud.bump(session, "games")
             session.commit()
-            session.refresh(new_games_roles)
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("game_id or role_id", "not found") from err
+            if is_violation(err, UNIQUE_VIOLATION):
+                raise BotCIntegrityError(
+                    "game_id and role_id", "duplicate detected"
+                ) from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_games_roles
 
-    @staticmethod
     def create_entities(
-        session: Session, json: List[Dict[str, Any]]
+        self, session: Session, json: List[Dict[str, Any]]
     ) -> List[GamesRoles]:
         """Insert multiple game role mappings in database."""
-        new_games_roles = [
-            GamesRoles(
-                game_id=entry["game_id"],
-                role_id=entry["role_id"],
-                id=entry.get("id", None),
-            )
+        rows = [
+            {
+                "game_id": entry["game_id"],
+                "role_id": entry["role_id"],
+                "id": entry.get("id"),
+            }
             for entry in json
         ]
+        games = session.scalars(
+            select(Game)
+            .where(Game.id.in_({entry["game_id"] for entry in json}))
+            .order_by(Game.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).all()
+        games_by_id = {game.id: game for game in games}
+        delta = StatsDelta()
+        for entry in json:
+            if entry["game_id"] in games_by_id:
+                delta.add_roles(games_by_id[entry["game_id"]], [entry["role_id"]])
 
         try:
-            session.add_all(new_games_roles)
+            new_games_roles = self.bulk_insert(session, rows)
+            stats_crud.apply(session, delta)
+            versions_crud.bump(session, "games")
             session.commit()
-            session.execute(
-                text(
-                    "SELECT SETVAL('games_roles_id_seq', (SELECT MAX(id) FROM games_roles));"
-                )
-            )
-            for games_roles in new_games_roles:
-                session.refresh(games_roles)
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("game_id or role_id", "not found") from err
+            if is_violation(err, UNIQUE_VIOLATION):
+                raise BotCIntegrityError(
+                    "game_id and role_id", "duplicate detected"
+                ) from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_games_roles
 
     def create_entities_for_game(
         self, session: Session, json: Sequence[Dict[str, Any]], game_id: int
-    ):
-        """Insert multiple game role mappings for one game in database."""
-        new_roles: List[Role] = [
-            roles_crud.get_entity_by_name(session, entry["name"]) for entry in json
-        ]
-        new_game_roles = [
-            GamesRoles(game_id=game_id, role_id=role.id, id=None) for role in new_roles
-        ]
-        new_game_roles_ids = [role.id for role in new_roles]
-        old_game_roles = self.get_entities_for_game(session, game_id)
-        old_game_role_ids = [role.role.id for role in old_game_roles]
-        roles_to_remove = [
-            role for role in old_game_roles if role.role.id not in new_game_roles_ids
-        ]
-        roles_to_add = [
-            role for role in new_game_roles if role.role_id not in old_game_role_ids
-        ]
+    ) -> Game:
+        """Set the roles of a game to the given role names.
+
+        The roles are reconciled with one multi-row INSERT and one DELETE, and the
+        game is returned with its roles reloaded in the same transaction. The game
+        and its roles are read under a lock on the game, so that concurrent writes
+        to the same game count each other's changes, and a missing game raises
+        BotCNotFoundError.
+        """
+        game = games_crud.get_entity(session, game_id, lock=True)
+        roles = roles_crud.get_entities_by_names(
+            session, [entry["name"] for entry in json]
+        )
+        wanted = {role.id: None for role in roles}
+        current = {game_role.role_id: game_role.id for game_role in game.roles}
+        added = [role_id for role_id in wanted if role_id not in current]
+        removed = [role_id for role_id in current if role_id not in wanted]
 
         try:
-            for new_game_role in roles_to_add:
-                session.add(new_game_role)
-            for old_game_role in roles_to_remove:
+            if added:
                 session.execute(
-                    delete(GamesRoles).where(GamesRoles.id == old_game_role.id)
+                    insert(GamesRoles).values(
+                        [{"game_id": game_id, "role_id": role_id} for role_id in added]
+                    )
                 )
+            if removed:
+                session.execute(
+                    delete(GamesRoles).where(
+                        GamesRoles.id.in_([current[role_id] for role_id in removed])
+                    )
+                )
+            stats_crud.apply(session, self._roles_delta(game, added, removed))
+            versions_crud.bump(session, "games")
+            session.refresh(game, ["roles"])
             session.commit()
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("game_id or role_id", "not found") from err
+            if is_violation(err, UNIQUE_VIOLATION):
+                raise BotCIntegrityError(
+                    "game_id and role_id", "duplicate detected"
+                ) from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
+        return game
+
+    @staticmethod
+    def _roles_delta(
+        game: Game, added: Sequence[int], removed: Sequence[int]
+    ) -> StatsDelta:
+        """Build statistics changes for role ids added to and removed from a game."""
+        delta = StatsDelta()
+        delta.add_roles(game, added)
+        delta.add_roles(game, removed, -1)
+        return delta
 
 
-games_roles_crud = GamesRolesCRUD(GamesRoles)
+games_roles_crud = GamesRolesCRUD(GamesRoles, resources=("games",))
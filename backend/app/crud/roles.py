@@ -1,62 +1,139 @@
 """BaseCRUD extension and instance for Role model."""
 
 import logging
-from typing import Any, Dict, List
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select, text
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached, selectinload
 
 from app.exceptions import BotCIntegrityError
-from app.models import Role
+from app.models import Game, Role
+from app.utils.metrics import count_cache_lookup
+
+from ._base import UNIQUE_VIOLATION, BaseCRUD, is_violation
+from .stats import StatsDelta, stats_crud
+from .versions import versions_crud
+
+
+class RoleCatalog:
+    """In-process copy of the roles table, indexed by id and by name.
+
+    The copy is loaded lazily and reloaded whenever the roles version no longer
+    matches, so writes from other processes are picked up too. Roles are kept as
+    detached instances and merged into a session without touching the database.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty catalog."""
+        self.version: Optional[int] = None
+        self.by_id: Dict[int, Role] = {}
+        self.by_name: Dict[str, Role] = {}
+        self.lock = Lock()
+
+    def invalidate(self) -> None:
+        """Force a reload on next use."""
+        self.version = None
+
+    def load(self, session: Session) -> "RoleCatalog":
+        """Reload the catalog if the roles version changed since the last load.
+
+        The version is checked once per session unless the catalog was invalidated.
+        """
+        if (
+            self.version is not None
+            and session.info.get("roles_version") == self.version
+        ):
+            return self
+        versions = versions_crud.get_versions(session, ["roles"])
+        version = versions["roles"].version if "roles" in versions else 0
+        session.info["roles_version"] = version
+        count_cache_lookup("roles", version == self.version)
+        if version == self.version:
+            return self
+        roles = []
+        for loaded in session.scalars(select(Role)).all():
+            role = Role(name=loaded.name, team=loaded.team, id=loaded.id)
+            make_transient_to_detached(role)
+            roles.append(role)
+        # the lock is not held across the query, which may yield to an event loop
+        with self.lock:
+            self.by_id = {role.id: role for role in roles}
+            self.by_name = {role.name: role for role in roles}
+            self.version = version
+        return self
+
+    def attach(self, session: Session) -> None:
+        """Merge all roles into the session, so role lookups skip the database.
+
+        The session only holds weak references, so the merged roles are kept in
+        its info dictionary for as long as the session lives.
+        """
+        session.info["roles"] = [
+            session.merge(role, load=False)
+            for role in self.load(session).by_id.values()
+        ]
+
 
-from ._base import BaseCRUD
+role_catalog = RoleCatalog()
 
 
 class RolesCRUD(BaseCRUD[Role]):
     """BaseCRUD extension and instance for Role model."""
 
-    def get_entity_by_name(self, session, name: str) -> Role:
-        """Get role by name."""
-        result = session.scalars(select(Role).where(Role.name == name)).first()
-        if result is None:
+    @staticmethod
+    def get_entity_by_name(session: Session, name: str) -> Role:
+        """Get role by name from the role catalog."""
+        role = role_catalog.load(session).by_name.get(name)
+        if role is None:
             raise BotCIntegrityError("Role name", f"Invalid name: {name}")
-        return result
+        return session.merge(role, load=False)
 
     @staticmethod
-    def create_entity(session: Session, json: Dict[str, Any]) -> Role:
+    def get_entities_by_names(session: Session, names: Sequence[str]) -> List[Role]:
+        """Get roles by name from the role catalog, in the order of the names."""
+        catalog = role_catalog.load(session)
+        roles = []
+        for name in names:
+            role = catalog.by_name.get(name)
+            if role is None:
+                raise BotCIntegrityError("Role name", f"Invalid name: {name}")
+            roles.append(session.merge(role, load=False))
+        return roles
+
+    def create_entity(self, session: Session, json: Dict[str, Any]) -> Role:
         """Insert role in database."""
-        new_role = Role(name=json["name"], team=json["team"], id=json.get("id", None))
+        row = {"name": json["name"], "team": json["team"], "id": json.get("id")}
 
         try:
-            session.add(new_role)
+            new_role = self.insert_row(session, row)
+            versions_crud.bump(session, "roles")
             session.commit()
-            session.refresh(new_role)
+            role_catalog.invalidate()
         except IntegrityError as err:
-            if "psycopg2.errors.UniqueViolation" in str(err):
+            if is_violation(err, UNIQUE_VIOLATION):
                 raise BotCIntegrityError("name", "already in use") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_role
 
-    @staticmethod
-    def create_entities(session: Session, json: List[Dict[str, Any]]) -> List[Role]:
+    def create_entities(
+        self, session: Session, json: List[Dict[str, Any]]
+    ) -> List[Role]:
         """Insert multiple roles in database."""
-        new_roles = [
-            Role(name=entry["name"], team=entry["team"], id=entry["id"])
+        rows = [
+            {"name": entry["name"], "team": entry["team"], "id": entry.get("id")}
             for entry in json
         ]
 
         try:
-            session.add_all(new_roles)
+            new_roles = self.bulk_insert(session, rows)
+            versions_crud.bump(session, "roles")
             session.commit()
-            session.execute(
-                text("SELECT SETVAL('roles_id_seq', (SELECT MAX(id) FROM roles));")
-            )
-            for role in new_roles:
-                session.refresh(role)
+            role_catalog.invalidate()
         except IntegrityError as err:
-            if "psycopg2.errors.UniqueViolation" in str(err):
+            if is_violation(err, UNIQUE_VIOLATION):
                 raise BotCIntegrityError("name", "duplicate detected") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
@@ -64,21 +141,41 @@ class RolesCRUD(BaseCRUD[Role]):
 
     def update_entity(self, session: Session, json: Dict[str, Any], id_: int) -> Role:
         """Update role in database."""
-        role: Role = self.get_entity(session, id_)
-        role.name = json["name"]
-        role.team = json["team"]
+        values = {"name": json["name"], "team": json["team"]}
 
         try:
-            session.add(role)
+            role = self.update_row(session, id_, values)
+            versions_crud.bump(session, "roles")
             session.commit()
-            session.refresh(role)
+            role_catalog.invalidate()
         except IntegrityError as err:
-            if "psycopg2.errors.UniqueViolation" in str(err):
+            if is_violation(err, UNIQUE_VIOLATION):
                 raise BotCIntegrityError("name", "already in use") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
 
         return role
 
-
-roles_crud = RolesCRUD(Role)
+    def delete_entity(self, session: Session, id_: int):
+        """Delete role by id.
+
+        The database deletes games where the drunk saw the role along with it, so
+        those are taken out of the statistics first.
+        """
+        games = session.scalars(
+            select(Game)
+            .where(Game.drunk_saw_role_id == id_)
+            .order_by(Game.id)
+            .with_for_update()
+            .options(selectinload(Game.roles))
+            .execution_options(populate_existing=True)
+        ).all()
+        delta = StatsDelta()
+        for game in games:
+            delta.add_game(game, -1)
+        stats_crud.apply(session, delta)
+        super().delete_entity(session, id_)
+        role_catalog.invalidate()
+
+
+roles_crud = RolesCRUD(Role, resources=("roles", "games", "scripts"))
@@ -3,50 +3,51 @@
 import logging
 from typing import Any, Dict, List
 
-from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.exceptions import BotCIntegrityError
 from app.models import Script
 
-from ._base import BaseCRUD
+from ._base import UNIQUE_VIOLATION, BaseCRUD, is_violation
+from .roles import role_catalog
+from .versions import versions_crud
 
 
 class ScriptsCRUD(BaseCRUD[Script]):
     """BaseCRUD extension and instance for Script model."""
 
-    @staticmethod
-    def create_entity(session: Session, json: Dict[str, Any]) -> Script:
+    def prepare_session(self, session: Session) -> None:
+        """Attach the role catalog, so the roles of each script load from memory."""
+        role_catalog.attach(session)
+
+    def create_entity(self, session: Session, json: Dict[str, Any]) -> Script:
         """Insert script in database."""
-        new_script = Script(name=json["name"], id=json.get("id", None))
+        row = {"name": json["name"], "id": json.get("id")}
 
         try:
-            session.add(new_script)
+            new_script = self.insert_row(session, row)
+            versions_crud.bump(session, "scripts")
             session.commit()
-            session.refresh(new_script)
         except IntegrityError as err:
-            if "psycopg2.errors.UniqueViolation" in str(err):
+            if is_violation(err, UNIQUE_VIOLATION):
                 raise BotCIntegrityError("name", "already in use") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_script
 
-    @staticmethod
-    def create_entities(session: Session, json: List[Dict[str, Any]]) -> List[Script]:
+    def create_entities(
+        self, session: Session, json: List[Dict[str, Any]]
+    ) -> List[Script]:
         """Insert multiple scripts in database."""
-        new_scripts = [Script(name=entry["name"], id=entry["id"]) for entry in json]
+        rows = [{"name": entry["name"], "id": entry.get("id")} for entry in json]
 
         try:
-            session.add_all(new_scripts)
+            new_scripts = self.bulk_insert(session, rows)
+            versions_crud.bump(session, "scripts")
             session.commit()
-            session.execute(
-                text("SELECT SETVAL('scripts_id_seq', (SELECT MAX(id) FROM scripts));")
-            )
-            for script in new_scripts:
-                session.refresh(script)
         except IntegrityError as err:
-            if "psycopg2.errors.UniqueViolation" in str(err):
+            if is_violation(err, UNIQUE_VIOLATION):
                 raise BotCIntegrityError("name", "duplicate detected") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
@@ -54,15 +55,12 @@ class ScriptsCRUD(BaseCRUD[Script]):
 
     def update_entity(self, session: Session, json: Dict[str, Any], id_: int) -> Script:
         """Update script in database."""
-        script: Script = self.get_entity(session, id_)
-        script.name = json["name"]
-
         try:
-            session.add(script)
+            script = self.update_row(session, id_, {"name": json["name"]})
+            versions_crud.bump(session, "scripts")
             session.commit()
-            session.refresh(script)
         except IntegrityError as err:
-            if "psycopg2.errors.UniqueViolation" in str(err):
+            if is_violation(err, UNIQUE_VIOLATION):
                 raise BotCIntegrityError("name", "already in use") from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
@@ -70,4 +68,8 @@ class ScriptsCRUD(BaseCRUD[Script]):
         return script
 
 
-scripts_crud = ScriptsCRUD(Script)
+scripts_crud = ScriptsCRUD(
+    Script,
+    eager_load=((Script.roles,),),
+    resources=("scripts", "games"),
+)
@@ -3,15 +3,16 @@
 import logging
 from typing import Any, Dict, List, Sequence
 
-from sqlalchemy import delete, select, text
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.exceptions import BotCIntegrityError
-from app.models import Role, ScriptsRoles
+from app.models import Script, ScriptsRoles
 
-from ._base import BaseCRUD
+from ._base import FOREIGN_KEY_VIOLATION, UNIQUE_VIOLATION, BaseCRUD, is_violation
 from .roles import roles_crud
+from .versions import versions_crud
 
 
 class ScriptsRolesCRUD(BaseCRUD[ScriptsRoles]):
@@ -30,91 +31,106 @@ class ScriptsRolesCRUD(BaseCRUD[ScriptsRoles]):
             )
         return result
 
-    @staticmethod
-    def create_entity(session: Session, json: Dict[str, Any]) -> ScriptsRoles:
+    def create_entity(self, session: Session, json: Dict[str, Any]) -> ScriptsRoles:
         """Insert script role mapping in database."""
-        new_scripts_roles = ScriptsRoles(
-            script_id=json["script_id"],
-            role_id=json["role_id"],
-            id=json.get("id", None),
-        )
+        row = {
+            "script_id": json["script_id"],
+            "role_id": json["role_id"],
+            "id": json.get("id"),
+        }
 
         try:
-            session.add(new_scripts_roles)
+            new_scripts_roles = self.insert_row(session, row)
+            versions_crud.bump(session, "scripts")
             session.commit()
-            session.refresh(new_scripts_roles)
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("script_id or role_id", "not found") from err
+            if is_violation(err, UNIQUE_VIOLATION):
+                raise BotCIntegrityError(
+                    "script_id and role_id", "duplicate detected"
+                ) from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_scripts_roles
 
-    @staticmethod
     def create_entities(
-        session: Session, json: List[Dict[str, Any]]
+        self, session: Session, json: List[Dict[str, Any]]
     ) -> List[ScriptsRoles]:
         """Insert multiple script roll mappings in database."""
-        new_scripts_roles = [
-            ScriptsRoles(
-                script_id=entry["script_id"],
-                role_id=entry["role_id"],
-                id=entry.get("id", None),
-            )
+        rows = [
+            {
+                "script_id": entry["script_id"],
+                "role_id": entry["role_id"],
+                "id": entry.get("id"),
+            }
             for entry in json
         ]
 
         try:
-            session.add_all(new_scripts_roles)
+            new_scripts_roles = self.bulk_insert(session, rows)
+            versions_crud.bump(session, "scripts")
             session.commit()
-            session.execute(
-                text(
-                    "SELECT SETVAL('scripts_roles_id_seq', (SELECT MAX(id) FROM scripts_roles));"
-                )
-            )
-            for scripts_roles in new_scripts_roles:
-                session.refresh(scripts_roles)
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("script_id or role_id", "not found") from err
+            if is_violation(err, UNIQUE_VIOLATION):
+                raise BotCIntegrityError(
+                    "script_id and role_id", "duplicate detected"
+                ) from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
         return new_scripts_roles
 
     def create_entities_for_script(
-        self, session: Session, json: List[Dict[str, Any]], script_id: int
-    ):
-        """Insert multiple script role mappings for one script in database."""
-        new_roles: List[Role] = [
-            roles_crud.get_entity_by_name(session, entry["name"]) for entry in json
-        ]
-        new_script_roles = [
-            ScriptsRoles(script_id=script_id, role_id=role.id, id=None)
-            for role in new_roles
-        ]
-        new_script_role_ids = [role.id for role in new_roles]
-        old_script_roles = self.get_entities_for_script(session, script_id)
-        old_script_role_ids = [role.role.id for role in old_script_roles]
-        roles_to_remove = [
-            role for role in old_script_roles if role.role.id not in new_script_role_ids
-        ]
-        roles_to_add = [
-            role for role in new_script_roles if role.role_id not in old_script_role_ids
-        ]
+        self, session: Session, json: Sequence[Dict[str, Any]], script_id: int
+    ) -> Script:
+        """Set the roles of a script to the given role names.
+
+        The roles are reconciled with one multi-row INSERT and one DELETE, and the
+        script is returned with its roles reloaded in the same transaction. It is
+        usually already in the session, loaded by the route to check it exists.
+        """
+        script = session.get(Script, script_id)
+        if script is None:
+            raise BotCIntegrityError("Script id", f"Invalid id: {script_id}")
+        roles = roles_crud.get_entities_by_names(
+            session, [entry["name"] for entry in json]
+        )
+        wanted = {role.id: None for role in roles}
+        current = {script_role.role_id: script_role.id for script_role in script.roles}
+        added = [role_id for role_id in wanted if role_id not in current]
+        removed = [role_id for role_id in current if role_id not in wanted]
 
         try:
-            for new_script_role in roles_to_add:
-                session.add(new_script_role)
-            for old_script_role in roles_to_remove:
+            if added:
+                session.execute(
+                    insert(ScriptsRoles).values(
+                        [
+                            {"script_id": script_id, "role_id": role_id}
+                            for role_id in added
+                        ]
+                    )
+                )
+            if removed:
                 session.execute(
-                    delete(ScriptsRoles).where(ScriptsRoles.id == old_script_role.id)
+                    delete(ScriptsRoles).where(
+                        ScriptsRoles.id.in_([current[role_id] for role_id in removed])
+                    )
                 )
+            versions_crud.bump(session, "scripts")
+            session.refresh(script, ["roles"])
             session.commit()
         except IntegrityError as err:
-            if "psycopg2.errors.ForeignKeyViolation" in str(err):
+            if is_violation(err, FOREIGN_KEY_VIOLATION):
                 raise BotCIntegrityError("script_id or role_id", "not found") from err
+            if is_violation(err, UNIQUE_VIOLATION):
+                raise BotCIntegrityError(
+                    "script_id and role_id", "duplicate detected"
+                ) from err
             logging.error(str(err))
             raise BotCIntegrityError("unknown", "unknown, see logs") from err
+        return script
 
 
-scripts_roles_crud = ScriptsRolesCRUD(ScriptsRoles)
+scripts_roles_crud = ScriptsRolesCRUD(ScriptsRoles, resources=("scripts",))
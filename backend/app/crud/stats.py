@@ -0,0 +1,296 @@
+"""Game statistics kept in counter tables updated by every game write."""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    and_,
+    case,
+    delete,
+    func,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Alignment,
+    DrunkStats,
+    Game,
+    GamesRoles,
+    GameStats,
+    Role,
+    RoleStats,
+    RoleType,
+    Script,
+)
+
+from .versions import versions_crud
+
+EVIL_TEAMS = (RoleType.DEMON, RoleType.MINION)
+
+GAME_KEYS = ("script_id", "player_count", "is_in_person", "winning_team")
+ROLE_KEYS = ("role_id", *GAME_KEYS)
+DRUNK_KEYS = ("role_id", "script_id", "player_count", "is_in_person")
+
+COUNTERS: Tuple[Tuple[Any, Tuple[str, ...]], ...] = (
+    (GameStats, GAME_KEYS),
+    (RoleStats, ROLE_KEYS),
+    (DrunkStats, DRUNK_KEYS),
+)
+
+
+def sum_where(condition: ColumnElement[bool], value: Any) -> ColumnElement[int]:
+    """Sum the value over the rows of a group matching the condition."""
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+
+def counter_order(item: Tuple[Tuple[Any, ...], int]) -> Tuple[Any, ...]:
+    """Sort key of a counter change, by its key with enums by value."""
+    return tuple(getattr(value, "value", value) for value in item[0])
+
+
+class StatsDelta:
+    """Pending changes to the counter tables, applied with `StatsCRUD.apply`."""
+
+    def __init__(self) -> None:
+        """Initialize with no changes."""
+        self.counts: Dict[Any, Counter] = {model: Counter() for model, _ in COUNTERS}
+
+    def add_game(
+        self, game: Game, sign: int = 1, role_ids: Optional[Iterable[int]] = None
+    ) -> None:
+        """Count a game and its roles, or remove them with a negative sign.
+
+        The current attribute values of the game are used, so a change to a game
+        is recorded by removing it before the update and adding it after.
+        """
+        key = tuple(getattr(game, name) for name in GAME_KEYS)
+        self.counts[GameStats][key] += sign
+        if game.drunk_saw_role_id is not None:
+            self.counts[DrunkStats][(game.drunk_saw_role_id, *key[:3])] += sign
+        if role_ids is None:
+            role_ids = [game_role.role_id for game_role in game.roles]
+        self.add_roles(game, role_ids, sign)
+
+    def add_roles(self, game: Game, role_ids: Iterable[int], sign: int = 1) -> None:
+        """Count roles of a game, or remove them with a negative sign."""
+        key = tuple(getattr(game, name) for name in GAME_KEYS)
+        for role_id in role_ids:
+            self.counts[RoleStats][(role_id, *key)] += sign
+
+
+class StatsCRUD:
+    """Win and loss aggregations read from the counter tables."""
+
+    @staticmethod
+    def apply(session: Session, delta: StatsDelta) -> None:
+        """Apply changes to the counter tables without committing.
+
+        Rows are upserted in the order of their keys, so that transactions
+        changing the same counters lock them in the same order.
+        """
+        for model, keys in COUNTERS:
+            rows = [
+                {**dict(zip(keys, key)), "games": count}
+                for key, count in sorted(delta.counts[model].items(), key=counter_order)
+                if count
+            ]
+            if not rows:
+                continue
+            stmt = insert(model).values(rows)
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=keys,
+                    set_={"games": model.games + stmt.excluded.games},
+                )
+            )
+            if any(row["games"] < 0 for row in rows):
+                session.execute(delete(model).where(model.games <= 0))
+
+    @staticmethod
+    def count_queries() -> Dict[Any, Select]:
+        """Build queries counting games from scratch, in the order of the keys."""
+        game_key = [getattr(Game, name) for name in GAME_KEYS]
+        drunk_key = [Game.drunk_saw_role_id, *game_key[:3]]
+        return {
+            GameStats: select(*game_key, func.count(Game.id)).group_by(*game_key),
+            RoleStats: select(GamesRoles.role_id, *game_key, func.count(GamesRoles.id))
+            .join(Game, GamesRoles.game_id == Game.id)
+            .group_by(GamesRoles.role_id, *game_key),
+            DrunkStats: select(*drunk_key, func.count(Game.id))
+            .where(Game.drunk_saw_role_id.is_not(None))
+            .group_by(*drunk_key),
+        }
+
+    def rebuild(self, session: Session) -> None:
+        """Recount all counter tables from the games."""
+        if session.get_bind().dialect.name == "postgresql":
+            session.execute(
+                text("LOCK TABLE game_stats, role_stats, drunk_stats IN EXCLUSIVE MODE")
+            )
+        queries = self.count_queries()
+        for model, keys in COUNTERS:
+            session.execute(delete(model))
+            session.execute(insert(model).from_select([*keys, "games"], queries[model]))
+        versions_crud.bump(session, "stats")
+        session.commit()
+
+    def check(self, session: Session) -> List[str]:
+        """Compare the counter tables with a count from scratch.
+
+        Returns a description of every mismatching counter.
+        """
+        queries = self.count_queries()
+        mismatches = []
+        for model, keys in COUNTERS:
+            expected = {
+                tuple(row[:-1]): row[-1] for row in session.execute(queries[model])
+            }
+            found = {
+                tuple(row[:-1]): row[-1]
+                for row in session.execute(
+                    select(*[getattr(model, name) for name in keys], model.games).where(
+                        model.games != 0
+                    )
+                )
+            }
+            for key in sorted(expected.keys() | found.keys(), key=str):
+                if expected.get(key, 0) != found.get(key, 0):
+                    mismatches.append(
+                        f"{model.__tablename__} {dict(zip(keys, key))}: "
+                        + f"expected {expected.get(key, 0)}, found {found.get(key, 0)}"
+                    )
+        return mismatches
+
+    @staticmethod
+    def filter_clauses(
+        model: Any, filters: Dict[str, Any]
+    ) -> List[ColumnElement[bool]]:
+        """Build where clauses on a counter table from the loaded filter schema."""
+        clauses = []
+        if filters.get("min_player_count") is not None:
+            clauses.append(model.player_count >= filters["min_player_count"])
+        if filters.get("script_id") is not None:
+            clauses.append(model.script_id == filters["script_id"])
+        if filters.get("is_in_person") is not None:
+            clauses.append(model.is_in_person == filters["is_in_person"])
+        return clauses
+
+    @staticmethod
+    def alignment_columns() -> List[ColumnElement[int]]:
+        """Columns counting evil and good wins of a group of game counters."""
+        return [
+            sum_where(GameStats.winning_team == Alignment.EVIL, GameStats.games).label(
+                "evil"
+            ),
+            sum_where(GameStats.winning_team == Alignment.GOOD, GameStats.games).label(
+                "good"
+            ),
+        ]
+
+    def get_role_stats(
+        self, session: Session, filters: Dict[str, Any]
+    ) -> Sequence[Row]:
+        """Get wins and losses per role, most played first."""
+        is_evil = Role.team.in_(EVIL_TEAMS)
+        won = or_(
+            and_(is_evil, RoleStats.winning_team == Alignment.EVIL),
+            and_(~is_evil, RoleStats.winning_team == Alignment.GOOD),
+        )
+        wins = sum_where(won, RoleStats.games)
+        # false positive
+        # pylint: disable-next=assignment-from-no-return
+        total = func.sum(RoleStats.games)
+        stmt = (
+            select(
+                Role.id.label("role_id"),
+                Role.name,
+                Role.team,
+                wins.label("wins"),
+                (total - wins).label("losses"),
+            )
+            .select_from(RoleStats)
+            .join(Role, RoleStats.role_id == Role.id)
+            .where(*self.filter_clauses(RoleStats, filters))
+            .group_by(Role.id, Role.name, Role.team)
+            .having(total > 0)
+            .order_by(total.desc(), wins.desc(), Role.name)
+        )
+        if filters.get("team") is not None:
+            stmt = stmt.where(Role.team == filters["team"])
+        return session.execute(stmt).all()
+
+    def get_team_stats(self, session: Session, filters: Dict[str, Any]) -> Row:
+        """Get wins per alignment."""
+        stmt = select(*self.alignment_columns()).where(
+            *self.filter_clauses(GameStats, filters)
+        )
+        return session.execute(stmt).one()
+
+    def get_script_stats(
+        self, session: Session, filters: Dict[str, Any]
+    ) -> Sequence[Row]:
+        """Get wins per alignment for each script, in creation order."""
+        stmt = (
+            select(Script.id.label("script_id"), Script.name, *self.alignment_columns())
+            .select_from(GameStats)
+            .join(Script, GameStats.script_id == Script.id)
+            .where(*self.filter_clauses(GameStats, filters))
+            .group_by(Script.id, Script.name)
+            .having(func.sum(GameStats.games) > 0)
+            .order_by(Script.id)
+        )
+        return session.execute(stmt).all()
+
+    def get_player_count_stats(
+        self, session: Session, filters: Dict[str, Any]
+    ) -> Sequence[Row]:
+        """Get wins per alignment for each player count."""
+        stmt = (
+            select(GameStats.player_count, *self.alignment_columns())
+            .where(*self.filter_clauses(GameStats, filters))
+            .group_by(GameStats.player_count)
+            .having(func.sum(GameStats.games) > 0)
+            .order_by(GameStats.player_count)
+        )
+        return session.execute(stmt).all()
+
+    def get_location_stats(
+        self, session: Session, filters: Dict[str, Any]
+    ) -> Sequence[Row]:
+        """Get wins per alignment online and in person."""
+        stmt = (
+            select(GameStats.is_in_person, *self.alignment_columns())
+            .where(*self.filter_clauses(GameStats, filters))
+            .group_by(GameStats.is_in_person)
+            .having(func.sum(GameStats.games) > 0)
+            .order_by(GameStats.is_in_person)
+        )
+        return session.execute(stmt).all()
+
+    def get_drunk_stats(
+        self, session: Session, filters: Dict[str, Any]
+    ) -> Sequence[Row]:
+        """Get how often the drunk saw each role, most seen first."""
+        # false positive
+        # pylint: disable-next=assignment-from-no-return
+        games = func.sum(DrunkStats.games)
+        stmt = (
+            select(Role.id.label("role_id"), Role.name, games.label("games"))
+            .select_from(DrunkStats)
+            .join(Role, DrunkStats.role_id == Role.id)
+            .where(*self.filter_clauses(DrunkStats, filters))
+            .group_by(Role.id, Role.name)
+            .having(games > 0)
+            .order_by(games.desc(), Role.name)
+        )
+        return session.execute(stmt).all()
+
+
+stats_crud = StatsCRUD()
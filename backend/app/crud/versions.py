@@ -0,0 +1,53 @@
+"""Version markers of resource collections, used for conditional requests."""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import ResourceVersion
+
+
+def utcnow() -> datetime:
+    """Get the current UTC time as a naive datetime, as stored in the database."""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+class VersionsCRUD:
+    """Reads and bumps resource collection versions."""
+
+    @staticmethod
+    def bump(session: Session, *resources: str) -> None:
+        """Increment the versions of the given resources without committing."""
+        now = utcnow()
+        for resource in sorted(set(resources)):
+            stmt = insert(ResourceVersion).values(
+                resource=resource, version=1, modified_at=now
+            )
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[ResourceVersion.resource],
+                    set_={
+                        "version": ResourceVersion.version + 1,
+                        "modified_at": stmt.excluded.modified_at,
+                    },
+                )
+            )
+
+    @staticmethod
+    def get_versions(
+        session: Session, resources: Iterable[str]
+    ) -> Dict[str, ResourceVersion]:
+        """Get the versions of the given resources by name.
+
+        Resources that were never written are missing from the result.
+        """
+        result = session.scalars(
+            select(ResourceVersion).where(ResourceVersion.resource.in_(resources))
+        ).all()
+        return {version.resource: version for version in result}
+
+
+versions_crud = VersionsCRUD()
@@ -1,23 +1,101 @@
 """Establish database connection."""
 
+import threading
+import time
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Any, Dict, Generator, Optional, cast
 
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
 
 from app import config
 
 
-def build_connection_string() -> str:
-    """Build database connection string."""
+def build_connection_string(dialect: str = "postgresql") -> str:
+    """Build database connection string, optionally naming the driver."""
     return (
-        f"postgresql://{config.DB_USER}:{config.DB_PASS}"
+        f"{dialect}://{config.DB_USER}:{config.DB_PASS}"
         + f"@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}"
     )
 
 
+class PoolTelemetry:
+    """Counters of connection checkouts from a pool, safe to share across threads."""
+
+    def __init__(self) -> None:
+        """Initialize with zeroed counters."""
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Record how long a checkout waited for a connection."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.in_use += 1
+                self.max_in_use = max(self.max_in_use, self.in_use)
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_return(self) -> None:
+        """Record a connection returned to the pool."""
+        with self._lock:
+            self.in_use -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the counters, with the mean wait per checkout."""
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "wait_total": self.wait_total,
+                "wait_max": self.wait_max,
+                "wait_mean": self.wait_total / waits if waits else 0.0,
+            }
+
+
+class TelemetryQueuePool(QueuePool):
+    """Queue pool that records checkout waits and connections in use."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the pool with fresh telemetry."""
+        super().__init__(*args, **kwargs)
+        self.telemetry = PoolTelemetry()
+
+    def recreate(self) -> "TelemetryQueuePool":
+        """Recreate the pool, keeping its telemetry."""
+        pool = cast(TelemetryQueuePool, super().recreate())
+        pool.telemetry = self.telemetry
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except PoolTimeoutError:
+            self.telemetry.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.telemetry.record_wait(time.perf_counter() - start)
+        return entry
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        self.telemetry.record_return()
+        super()._do_return_conn(record)
+
+
 class Database:
     """Database static class."""
 
@@ -25,14 +103,50 @@ class Database:
 
     @classmethod
     def establish_connection(cls) -> None:
-        """Create database connection."""
-        cls.engine = create_engine(build_connection_string())
+        """Create database connection.
+
+        The pool is sized from the POOL_* settings. Connections are pinged before
+        use and recycled after POOL_RECYCLE seconds, so that they survive database
+        restarts, and handed out last in, first out, so that idle ones can expire.
+        """
+        cls.engine = create_engine(
+            build_connection_string(),
+            poolclass=TelemetryQueuePool,
+            pool_size=config.POOL_SIZE,
+            max_overflow=config.POOL_MAX_OVERFLOW,
+            pool_timeout=config.POOL_TIMEOUT,
+            pool_recycle=config.POOL_RECYCLE,
+            pool_pre_ping=config.POOL_PRE_PING,
+            pool_use_lifo=config.POOL_USE_LIFO,
+        )
+
+    @classmethod
+    def pool_status(cls) -> Dict[str, Any]:
+        """Get the occupancy of the connection pool and its checkout telemetry."""
+        pool = cls.engine.pool if cls.engine is not None else None
+        status: Dict[str, Any] = {"pool": type(pool).__name__ if pool else None}
+        if isinstance(pool, QueuePool):
+            status.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+                max_overflow=pool._max_overflow,  # pylint: disable=protected-access
+                timeout=pool.timeout(),
+            )
+        if isinstance(pool, TelemetryQueuePool):
+            status.update(pool.telemetry.snapshot())
+        return status
 
 
 @contextmanager
 def generate_session() -> Generator[Session, None, None]:
-    """Generate database session."""
-    session = Session(Database.engine)
+    """Generate database session.
+
+    Entities are not expired on commit, so what a write path loaded or refreshed
+    inside its transaction can be serialized without another round trip.
+    """
+    session = Session(Database.engine, expire_on_commit=False)
     try:
         yield session
     finally:
@@ -5,6 +5,10 @@ class BotCError(Exception):
     """Error for generic exceptions."""
 
 
+class NPlusOneError(BotCError):
+    """Error for a statement run repeatedly in one request, like N+1 lazy loads."""
+
+
 class BotCIntegrityError(Exception):
     """Error for SQL integrity exceptions."""
 
@@ -12,3 +16,7 @@ class BotCIntegrityError(Exception):
         """Initialize with dict to match marshmallow validation."""
         self.messages = {field: value}
         super().__init__(f"{field} - {value}")
+
+
+class BotCNotFoundError(BotCIntegrityError):
+    """Error for an entity looked up by id that does not exist."""
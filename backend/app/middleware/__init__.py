@@ -1,3 +1,5 @@
 """Middleware."""
 
-from .log import log_request
+from .compress import compress_response
+from .log import end_request_timing, log_request, start_request_timing
+from .metrics import record_metrics, reject_request
@@ -0,0 +1,89 @@
+"""Response compression middleware."""
+
+import gzip
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+from flask import Response, request
+
+from app.config import COMPRESS_BROTLI_QUALITY, COMPRESS_GZIP_LEVEL, COMPRESS_MIN_SIZE
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+
+
+def accepted_encoding() -> Optional[str]:
+    """Pick the encoding to compress with from the request's Accept-Encoding."""
+    encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(encodings)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a whole body with the given encoding."""
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks: Iterable[Any], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk.
+
+    Each chunk is flushed as soon as it is compressed, so a client reading a
+    stream of NDJSON lines still receives every line as it is produced.
+    """
+    if encoding == "br" and brotli is not None:
+        compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        for chunk in chunks:
+            data = chunk.encode() if isinstance(chunk, str) else chunk
+            yield compressor.process(data) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressobj = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = chunk.encode() if isinstance(chunk, str) else chunk
+            yield compressobj.compress(data) + compressobj.flush(zlib.Z_SYNC_FLUSH)
+        yield compressobj.flush()
+
+
+def compress_response(response: Response) -> Response:
+    """Compress the body of a response the client accepts compressed.
+
+    Bodies smaller than COMPRESS_MIN_SIZE are left alone, as are files sent
+    directly and responses already encoded, such as those from the cache of
+    conditional routes.
+    """
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
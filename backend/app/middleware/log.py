@@ -1,12 +1,46 @@
 """Request logging middleware."""
 
 import logging
+from typing import Optional
 
-from flask import request
+from flask import Response, request
 
-from app.config import REQUEST_IP_HEADER
+from app.config import REQUEST_IP_HEADER, SERVER_TIMING
+from app.utils.timing import count_bytes, current_timings, end_timings, start_timings
 
 
-def log_request() -> None:
-    """Log request info."""
-    logging.info(f"{request.headers[REQUEST_IP_HEADER]} - {request.path}")
+def start_request_timing() -> None:
+    """Start timing the request."""
+    rule = request.url_rule.rule if request.url_rule else request.path
+    start_timings(f"{request.method} {rule}")
+
+
+def end_request_timing(_error: Optional[BaseException]) -> None:
+    """Stop timing the request once it is torn down."""
+    end_timings()
+
+
+def log_request(response: Response) -> Response:
+    """Log request info, with its duration, database time and response size.
+
+    The Server-Timing header carries the same timings to the client. Streamed
+    responses are logged once their body is sent, and their header only covers
+    the time to the first byte.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return response
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = timings.server_timing()
+    line = f"{request.headers.get(REQUEST_IP_HEADER)} - {request.method} {request.path}"
+
+    def log() -> None:
+        logging.info(f"{line} - {response.status_code} - {timings.summary()}")
+
+    if response.is_streamed:
+        response.response = count_bytes(timings, response.response)
+        response.call_on_close(log)
+    else:
+        timings.size = response.content_length or 0
+        log()
+    return response
@@ -0,0 +1,38 @@
+"""Request metrics middleware."""
+
+from typing import Any, Tuple, Union
+
+from flask import Response, request
+from marshmallow import ValidationError
+
+from app.database import Database
+from app.exceptions import BotCIntegrityError
+from app.utils.metrics import count_rejection, observe_pool, observe_request
+from app.utils.timing import current_timings
+
+
+def route_rule() -> str:
+    """Get the rule of the route the request matched, which metrics are labelled by."""
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+def record_metrics(response: Response) -> Response:
+    """Count the request, observe its latency and refresh the pool gauges.
+
+    The gauges are refreshed on every request, since a scrape is served by a
+    single worker and only sees the values the others last wrote.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return response
+    observe_request(request.method, route_rule(), response.status_code, timings)
+    observe_pool(Database.pool_status())
+    return response
+
+
+def reject_request(
+    error: Union[BotCIntegrityError, ValidationError]
+) -> Tuple[Any, int]:
+    """Answer a request failing validation or an integrity check, counting it."""
+    count_rejection(request.method, route_rule(), type(error).__name__)
+    return error.messages, 400
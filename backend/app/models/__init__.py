@@ -3,6 +3,8 @@
 from ._base import MetadataBase, ModelBase
 from .game import Alignment, Game
 from .games_roles import GamesRoles
+from .resource_version import ResourceVersion
 from .role import Role, RoleType
 from .script import Script
 from .scripts_roles import ScriptsRoles
+from .stats import DrunkStats, GameStats, RoleStats
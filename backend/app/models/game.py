@@ -4,7 +4,7 @@ import enum
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ._base import MetadataBase, ModelBase
@@ -22,6 +22,10 @@ class Game(MetadataBase, ModelBase):
     """Model class."""
 
     __tablename__ = "games"
+    __table_args__ = (
+        Index("ix_games_date_id", "date", "id"),
+        Index("ix_games_script_id_date_id", "script_id", "date", "id"),
+    )
 
     player_count: Mapped[int]
     date: Mapped[datetime]
@@ -36,5 +40,5 @@ class Game(MetadataBase, ModelBase):
         default_factory=list, back_populates="game"
     )
     drunk_saw_role_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("roles.id", ondelete="CASCADE")
+        ForeignKey("roles.id", ondelete="CASCADE"), index=True
     )
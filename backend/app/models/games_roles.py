@@ -2,7 +2,7 @@
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ._base import MetadataBase, ModelBase
@@ -16,9 +16,10 @@ class GamesRoles(MetadataBase, ModelBase):
     """Table for Games and Roles many-to-many relationship."""
 
     __tablename__ = "games_roles"
+    __table_args__ = (UniqueConstraint("game_id", "role_id"),)
 
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id"))
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"))
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), index=True)
 
     game: Mapped["Game"] = relationship(back_populates="roles", init=False)
     role: Mapped["Role"] = relationship(init=False)
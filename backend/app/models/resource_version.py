@@ -0,0 +1,17 @@
+"""Version markers for resource collections, bumped by every write."""
+
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ._base import MetadataBase, ModelBase
+
+
+class ResourceVersion(MetadataBase, ModelBase):
+    """Version and last modification time of a resource collection."""
+
+    __tablename__ = "resource_versions"
+
+    resource: Mapped[str] = mapped_column(unique=True)
+    version: Mapped[int]
+    modified_at: Mapped[datetime]
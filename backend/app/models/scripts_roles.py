@@ -2,7 +2,7 @@
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ._base import MetadataBase, ModelBase
@@ -16,9 +16,10 @@ class ScriptsRoles(MetadataBase, ModelBase):
     """Table for Scripts and Roles many-to-many relationship."""
 
     __tablename__ = "scripts_roles"
+    __table_args__ = (UniqueConstraint("script_id", "role_id"),)
 
     script_id: Mapped[int] = mapped_column(ForeignKey("scripts.id"))
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"))
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), index=True)
 
     script: Mapped["Script"] = relationship(back_populates="roles", init=False)
     role: Mapped["Role"] = relationship(init=False)
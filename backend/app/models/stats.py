@@ -0,0 +1,59 @@
+"""Counter tables for game statistics, kept up to date by the game writes."""
+
+from sqlalchemy import Enum, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ._base import MetadataBase, ModelBase
+from .game import Alignment
+
+
+class GameStats(MetadataBase, ModelBase):
+    """Number of games per script, player count, location and winning team."""
+
+    __tablename__ = "game_stats"
+    __table_args__ = (
+        UniqueConstraint("script_id", "player_count", "is_in_person", "winning_team"),
+    )
+
+    script_id: Mapped[int] = mapped_column(ForeignKey("scripts.id", ondelete="CASCADE"))
+    player_count: Mapped[int]
+    is_in_person: Mapped[bool]
+    winning_team: Mapped[Alignment] = mapped_column(
+        Enum(Alignment, create_constraint=True, name="alignment")
+    )
+    games: Mapped[int]
+
+
+class RoleStats(MetadataBase, ModelBase):
+    """Number of games a role was in per script, player count, location and winner."""
+
+    __tablename__ = "role_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "role_id", "script_id", "player_count", "is_in_person", "winning_team"
+        ),
+    )
+
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id", ondelete="CASCADE"))
+    script_id: Mapped[int] = mapped_column(ForeignKey("scripts.id", ondelete="CASCADE"))
+    player_count: Mapped[int]
+    is_in_person: Mapped[bool]
+    winning_team: Mapped[Alignment] = mapped_column(
+        Enum(Alignment, create_constraint=True, name="alignment")
+    )
+    games: Mapped[int]
+
+
+class DrunkStats(MetadataBase, ModelBase):
+    """Number of games the drunk saw a role per script, player count and location."""
+
+    __tablename__ = "drunk_stats"
+    __table_args__ = (
+        UniqueConstraint("role_id", "script_id", "player_count", "is_in_person"),
+    )
+
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id", ondelete="CASCADE"))
+    script_id: Mapped[int] = mapped_column(ForeignKey("scripts.id", ondelete="CASCADE"))
+    player_count: Mapped[int]
+    is_in_person: Mapped[bool]
+    games: Mapped[int]
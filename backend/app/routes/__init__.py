@@ -2,9 +2,12 @@
 
 from flask import Blueprint
 
+from .diagnostics import create_router as create_diagnostics_router
 from .games import create_router as create_game_router
+from .metrics import create_router as create_metrics_router
 from .roles import create_router as create_role_router
 from .scripts import create_router as create_script_router
+from .stats import create_router as create_stats_router
 
 
 def create_router() -> Blueprint:
@@ -13,4 +16,7 @@ def create_router() -> Blueprint:
     router.register_blueprint(create_game_router())
     router.register_blueprint(create_role_router())
     router.register_blueprint(create_script_router())
+    router.register_blueprint(create_stats_router())
+    router.register_blueprint(create_diagnostics_router())
+    router.register_blueprint(create_metrics_router())
     return router
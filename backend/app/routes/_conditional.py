@@ -0,0 +1,135 @@
+"""Conditional GET support for read routes."""
+
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from flask import Response, make_response, request
+from werkzeug.datastructures import Headers
+
+from app.config import RESPONSE_CACHE_SIZE
+from app.crud import versions_crud
+from app.database import generate_session
+from app.middleware import compress_response
+from app.middleware.compress import accepted_encoding
+from app.utils.metrics import count_cache_lookup
+
+CacheKey = Tuple[str, str, str, str]
+
+
+class CachedResponse(NamedTuple):
+    """Encoded body and headers of a rendered response."""
+
+    body: bytes
+    headers: Headers
+
+
+class ResponseCache:
+    """Bounded in-process cache of the encoded responses of conditional routes.
+
+    Entries are keyed by the validator tag, so a write, which bumps a resource
+    version, leaves every entry rendered before it unreachable until the least
+    recently used ones are evicted. A hit skips the route, its serialization
+    and the compression of its body.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty cache holding at most size responses."""
+        self.size = size
+        self.entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Get a cached response and mark it as recently used."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> None:
+        """Cache a response, evicting the least recently used beyond the size."""
+        if self.size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+
+
+def render(etag: str, view: Callable[[], Any]) -> Response:
+    """Render a view, or reuse its encoded response for the same tag and request.
+
+    Responses are cached per URL, Accept header and negotiated encoding, already
+    compressed. Streamed responses and errors are never cached.
+    """
+    key = (
+        etag,
+        request.full_path,
+        request.headers.get("Accept", ""),
+        accepted_encoding() or "identity",
+    )
+    entry = response_cache.get(key)
+    count_cache_lookup("response", entry is not None)
+    if entry is not None:
+        return Response(entry.body, headers=entry.headers.copy())
+    response = compress_response(make_response(view()))
+    if response.status_code == 200 and not response.is_streamed:
+        entry = CachedResponse(response.get_data(), response.headers.copy())
+        response_cache.put(key, entry)
+    return response
+
+
+def conditional(*resources: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a read route with validators derived from resource versions.
+
+    The ETag and Last-Modified of a response are built from the versions of the
+    resources it depends on, which are read before the route runs. A request whose
+    If-None-Match or If-Modified-Since still matches is answered with 304 without
+    running the route. A write racing the route can only make the tag older than
+    the body, which costs the client one extra download, never a stale cache.
+    """
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Response:
+            with generate_session() as session:
+                versions = versions_crud.get_versions(session, resources)
+            numbers = {name: version.version for name, version in versions.items()}
+            etag = "-".join(
+                f"{resource}.{numbers.get(resource, 0)}" for resource in resources
+            )
+            last_modified = max(
+                (version.modified_at for version in versions.values()), default=None
+            )
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = (
+                    last_modified is not None
+                    and request.if_modified_since is not None
+                    and last_modified <= request.if_modified_since.replace(tzinfo=None)
+                )
+
+            response = (
+                Response(status=304)
+                if not_modified
+                else render(etag, lambda: view(*args, **kwargs))
+            )
+            if response.status_code in (200, 304):
+                response.set_etag(etag, weak=True)
+                if last_modified is not None:
+                    response.last_modified = last_modified
+                response.cache_control.no_cache = True
+                response.vary.add("Accept")
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,46 @@
+"""Streaming responses for list routes."""
+
+from typing import Any, Callable, Dict, Iterator
+
+from flask import Response, current_app, request, stream_with_context
+
+from app.crud import BaseCRUD
+from app.database import generate_session
+from app.utils.timing import allow_repeated_statements, timed_serialization
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_stream(params: Dict[str, Any]) -> bool:
+    """Check whether the client asked for a streamed listing."""
+    if params.get("stream"):
+        return True
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def stream_listing(
+    crud: BaseCRUD, dump: Callable[[Any], Any], params: Dict[str, Any]
+) -> Response:
+    """Stream entities matching the loaded page schema as newline-delimited JSON.
+
+    Each entity is serialized with dump, a Schema.dump or a compiled equivalent.
+
+    The cursor is decoded up front so that an invalid one still fails with a
+    BotCIntegrityError before any of the response is sent. Streams are read in
+    batches, so unlike pages they are only bounded by a limit the client gives.
+    """
+    after = crud.decode_cursor(params["cursor"]) if params.get("cursor") else None
+    limit = params["limit"] if "limit" in request.args else None
+
+    def generate() -> Iterator[str]:
+        allow_repeated_statements()
+        with generate_session() as session:
+            for entity in crud.stream_entities(
+                session, params, after=after, limit=limit
+            ):
+                with timed_serialization():
+                    data = dump(entity)
+                yield current_app.json.dumps(data) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,36 @@
+"""Diagnostics routes."""
+
+from typing import Any, Tuple
+
+from flask import Blueprint, jsonify
+
+from app.database import Database
+from app.schemas import PoolStatusSchema
+
+pool_status_schema = PoolStatusSchema()
+
+
+def get_pool_status() -> Tuple[Any, int]:
+    """Get connection pool status route.
+
+    ---
+    get:
+      description: >
+        Occupancy of this worker's connection pool, with how many checkouts it
+        served, how long they waited for a connection and how many timed out
+      responses:
+        200:
+          description: Connection pool status of the worker serving the request
+          content:
+            application/json:
+              schema: PoolStatusSchema
+    """
+    result = pool_status_schema.dump(Database.pool_status())
+    return jsonify(result), 200
+
+
+def create_router() -> Blueprint:
+    """Router factory."""
+    router = Blueprint("diagnostics", __name__, url_prefix="/diagnostics")
+    router.route("/pool", methods=["GET"])(get_pool_status)
+    return router
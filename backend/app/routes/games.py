@@ -3,14 +3,25 @@
 from typing import Any, List, Mapping, Tuple, cast
 
 from flask import Blueprint, jsonify, request
-from marshmallow import ValidationError
 
 from app.crud import games_crud, games_roles_crud
 from app.database import generate_session
-from app.exceptions import BotCIntegrityError
-from app.schemas import GameSchema, GamesRolesSchema, RoleSchema
+from app.exceptions import BotCIntegrityError, BotCNotFoundError
+from app.schemas import (
+    GamePageSchema,
+    GameSchema,
+    GamesRolesSchema,
+    RoleSchema,
+    compile_dump,
+)
+from app.utils.timing import timed_serialization
+
+from ._conditional import conditional
+from ._streaming import stream_listing, wants_stream
 
 schema = GameSchema()
+dump = compile_dump(schema)
+page_schema = GamePageSchema()
 role_schema = RoleSchema()
 games_roles_schema = GamesRolesSchema()
 
@@ -20,7 +31,62 @@ def list_games() -> Tuple[Any, int]:
 
     ---
     get:
-      description: List games
+      description: List games ordered by date, a page at a time
+      parameters:
+        - in: query
+          name: limit
+          schema:
+            type: integer
+          description: Maximum number of games to return, by default the
+            largest page the server allows
+        - in: query
+          name: cursor
+          schema:
+            type: string
+          description: The nextCursor of the previous page
+        - in: query
+          name: stream
+          schema:
+            type: boolean
+          description: Stream games as newline-delimited JSON
+        - in: query
+          name: scriptId
+          schema:
+            type: integer
+          description: Only include games played on this script
+        - in: query
+          name: winningTeam
+          schema:
+            type: string
+            enum: [EVIL, GOOD]
+          description: Only include games won by this team
+        - in: query
+          name: isInPerson
+          schema:
+            type: boolean
+          description: Only include games played in person or online
+        - in: query
+          name: minPlayerCount
+          schema:
+            type: integer
+          description: Only include games with at least this many players
+        - in: query
+          name: maxPlayerCount
+          schema:
+            type: integer
+          description: Only include games with at most this many players
+        - in: query
+          name: dateFrom
+          schema:
+            type: string
+            format: date
+          description: Only include games played on or after this date
+        - in: query
+          name: dateTo
+          schema:
+            type: string
+            format: date
+          description: Only include games played on or before this date
       responses:
         200:
           description: List games
@@ -32,11 +98,26 @@ def list_games() -> Tuple[Any, int]:
                     type: array
                     items:
                       $ref: '#/components/schemas/Game'
+                  nextCursor:
+                    type: string
+                    nullable: true
+            application/x-ndjson:
+              schema:
+                $ref: '#/components/schemas/Game'
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
     """
+    params = page_schema.load(request.args)
+    if wants_stream(params):
+        return stream_listing(games_crud, dump, params), 200
     with generate_session() as session:
-        raw_games = games_crud.get_entities(session)
-        games = [schema.dump(game) for game in raw_games]
-    result = {"result": games}
+        raw_games, next_cursor = games_crud.get_page(session, params)
+        with timed_serialization():
+            games = [dump(game) for game in raw_games]
+    result = {"result": games, "nextCursor": next_cursor}
     return jsonify(result), 200
 
 
@@ -62,15 +143,9 @@ def create_game() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_game = games_crud.create_entity(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_game = games_crud.create_entity(session, data)
         result = schema.dump(raw_game)
     return jsonify(result), 201
 
@@ -105,15 +180,9 @@ def create_game_bulk() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
     with generate_session() as session:
-        try:
-            raw_games = games_crud.create_entities(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_games = games_crud.create_entities(session, data)
         result = schema.dump(raw_games, many=True)
     return jsonify({"result": result}), 201
 
@@ -145,7 +214,7 @@ def get_game(game_id: str) -> Tuple[Any, int]:
             raw_game = games_crud.get_entity(session, int(game_id))
         except BotCIntegrityError:
             return "Resource not found", 404
-        result = schema.dump(raw_game)
+        result = dump(raw_game)
     return jsonify(result), 200
 
 
@@ -178,15 +247,9 @@ def update_game(game_id: str) -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_game = games_crud.update_entity(session, data, int(game_id))
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_game = games_crud.update_entity(session, data, int(game_id))
         result = schema.dump(raw_game)
     return jsonify(result), 200
 
@@ -235,15 +298,9 @@ def create_games_roles() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = games_roles_schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = games_roles_schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_games_roles = games_roles_crud.create_entity(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_games_roles = games_roles_crud.create_entity(session, data)
         result = schema.dump(raw_games_roles)
     return jsonify(result), 201
 
@@ -278,17 +335,11 @@ def create_games_roles_bulk() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = games_roles_schema.load(
-            cast(List[Mapping[str, Any]], request.json), many=True
-        )
-    except ValidationError as err:
-        return err.messages, 400
+    data = games_roles_schema.load(
+        cast(List[Mapping[str, Any]], request.json), many=True
+    )
     with generate_session() as session:
-        try:
-            raw_games_roles = games_roles_crud.create_entities(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_games_roles = games_roles_crud.create_entities(session, data)
         result = schema.dump(raw_games_roles, many=True)
     return jsonify({"result": result}), 201
 
@@ -327,18 +378,13 @@ def set_game_roles(game_id: str) -> Tuple[Any, int]:
         404:
           description: Game not found
     """
-    try:
-        data = role_schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
-    except ValidationError as err:
-        return err.messages, 400
+    data = role_schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
     with generate_session() as session:
         try:
-            games_roles_crud.create_entities_for_game(session, data, int(game_id))
-        except BotCIntegrityError as err:
-            return err.messages, 400
-        try:
-            raw_game = games_crud.get_entity(session, int(game_id))
-        except BotCIntegrityError:
+            raw_game = games_roles_crud.create_entities_for_game(
+                session, data, int(game_id)
+            )
+        except BotCNotFoundError:
             return "Resource not found", 404
         result = schema.dump(raw_game)
     return jsonify(result), 200
@@ -347,12 +393,12 @@ def set_game_roles(game_id: str) -> Tuple[Any, int]:
 def create_router() -> Blueprint:
     """Router factory."""
     router = Blueprint("games", __name__, url_prefix="/games")
-    router.route("", methods=["GET"])(list_games)
+    router.route("", methods=["GET"])(conditional("games", "roles")(list_games))
     router.route("", methods=["POST"])(create_game)
     router.route("/bulk", methods=["POST"])(create_game_bulk)
     router.route("/roles", methods=["POST"])(create_games_roles)
     router.route("/roles/bulk", methods=["POST"])(create_games_roles_bulk)
-    router.route("/<game_id>", methods=["GET"])(get_game)
+    router.route("/<game_id>", methods=["GET"])(conditional("games", "roles")(get_game))
     router.route("/<game_id>", methods=["PUT"])(update_game)
     router.route("/<game_id>", methods=["DELETE"])(delete_game)
     router.route("/<game_id>/roles", methods=["POST"])(set_game_roles)
@@ -0,0 +1,39 @@
+"""Metrics routes."""
+
+from typing import Any, Tuple
+
+from flask import Blueprint, Response
+
+from app.utils.metrics import exposition
+
+
+def get_metrics() -> Tuple[Any, int]:
+    """Get metrics route.
+
+    ---
+    get:
+      description: >
+        Request counts, latency histograms, error counts, connection pool gauges
+        and cache lookups of all workers, in the Prometheus text format
+      responses:
+        200:
+          description: Metrics in the Prometheus text exposition format
+          content:
+            text/plain:
+              schema:
+                type: string
+        501:
+          description: Failure due to prometheus_client not being installed
+    """
+    rendered = exposition()
+    if rendered is None:
+        return {"metrics": "prometheus_client is not installed"}, 501
+    body, content_type = rendered
+    return Response(body, content_type=content_type), 200
+
+
+def create_router() -> Blueprint:
+    """Router factory."""
+    router = Blueprint("metrics", __name__, url_prefix="/metrics")
+    router.route("", methods=["GET"])(get_metrics)
+    return router
@@ -3,14 +3,19 @@
 from typing import Any, List, Mapping, Tuple, cast
 
 from flask import Blueprint, jsonify, request
-from marshmallow import ValidationError
 
 from app.crud import roles_crud
 from app.database import generate_session
 from app.exceptions import BotCIntegrityError
-from app.schemas import RoleSchema
+from app.schemas import PageSchema, RoleSchema, compile_dump
+from app.utils.timing import timed_serialization
+
+from ._conditional import conditional
+from ._streaming import stream_listing, wants_stream
 
 schema = RoleSchema()
+dump = compile_dump(schema)
+page_schema = PageSchema()
 
 
 def list_roles() -> Tuple[Any, int]:
@@ -18,7 +23,24 @@ def list_roles() -> Tuple[Any, int]:
 
     ---
     get:
-      description: List roles
+      description: List roles ordered by id, a page at a time
+      parameters:
+        - in: query
+          name: limit
+          schema:
+            type: integer
+          description: Maximum number of roles to return, by default the
+            largest page the server allows
+        - in: query
+          name: cursor
+          schema:
+            type: string
+          description: The nextCursor of the previous page
+        - in: query
+          name: stream
+          schema:
+            type: boolean
+          description: Stream roles as newline-delimited JSON
       responses:
         200:
           description: List roles
@@ -30,11 +52,26 @@ def list_roles() -> Tuple[Any, int]:
                     type: array
                     items:
                       $ref: '#/components/schemas/Role'
+                  nextCursor:
+                    type: string
+                    nullable: true
+            application/x-ndjson:
+              schema:
+                $ref: '#/components/schemas/Role'
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
     """
+    params = page_schema.load(request.args)
+    if wants_stream(params):
+        return stream_listing(roles_crud, dump, params), 200
     with generate_session() as session:
-        raw_roles = roles_crud.get_entities(session)
-        roles = [schema.dump(role) for role in raw_roles]
-    result = {"result": roles}
+        raw_roles, next_cursor = roles_crud.get_page(session, params)
+        with timed_serialization():
+            roles = [dump(role) for role in raw_roles]
+    result = {"result": roles, "nextCursor": next_cursor}
     return jsonify(result), 200
 
 
@@ -60,15 +97,9 @@ def create_role() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_role = roles_crud.create_entity(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_role = roles_crud.create_entity(session, data)
         result = schema.dump(raw_role)
     return jsonify(result), 201
 
@@ -103,15 +134,9 @@ def create_role_bulk() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
     with generate_session() as session:
-        try:
-            raw_roles = roles_crud.create_entities(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_roles = roles_crud.create_entities(session, data)
         result = schema.dump(raw_roles, many=True)
     return jsonify(result), 201
 
@@ -143,7 +168,7 @@ def get_role(role_id: str) -> Tuple[Any, int]:
             raw_role = roles_crud.get_entity(session, int(role_id))
         except BotCIntegrityError:
             return "Resource not found", 404
-        result = schema.dump(raw_role)
+        result = dump(raw_role)
     return jsonify(result), 200
 
 
@@ -176,15 +201,9 @@ def update_role(role_id: str) -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_role = roles_crud.update_entity(session, data, int(role_id))
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_role = roles_crud.update_entity(session, data, int(role_id))
         result = schema.dump(raw_role)
     return jsonify(result), 200
 
@@ -214,10 +233,10 @@ def delete_role(role_id: str) -> Tuple[Any, int]:
 def create_router() -> Blueprint:
     """Router factory."""
     router = Blueprint("roles", __name__, url_prefix="/roles")
-    router.route("", methods=["GET"])(list_roles)
+    router.route("", methods=["GET"])(conditional("roles")(list_roles))
     router.route("", methods=["POST"])(create_role)
     router.route("/bulk", methods=["POST"])(create_role_bulk)
-    router.route("/<role_id>", methods=["GET"])(get_role)
+    router.route("/<role_id>", methods=["GET"])(conditional("roles")(get_role))
     router.route("/<role_id>", methods=["PUT"])(update_role)
     router.route("/<role_id>", methods=["DELETE"])(delete_role)
     return router
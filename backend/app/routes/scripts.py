@@ -3,14 +3,25 @@
 from typing import Any, List, Mapping, Tuple, cast
 
 from flask import Blueprint, jsonify, request
-from marshmallow import ValidationError
 
 from app.crud import scripts_crud, scripts_roles_crud
 from app.database import generate_session
 from app.exceptions import BotCIntegrityError
-from app.schemas import RoleSchema, ScriptSchema, ScriptsRolesSchema
+from app.schemas import (
+    PageSchema,
+    RoleSchema,
+    ScriptSchema,
+    ScriptsRolesSchema,
+    compile_dump,
+)
+from app.utils.timing import timed_serialization
+
+from ._conditional import conditional
+from ._streaming import stream_listing, wants_stream
 
 schema = ScriptSchema()
+dump = compile_dump(schema)
+page_schema = PageSchema()
 role_schema = RoleSchema()
 scripts_roles_schema = ScriptsRolesSchema()
 
@@ -20,7 +31,24 @@ def list_scripts() -> Tuple[Any, int]:
 
     ---
     get:
-      description: List scripts
+      description: List scripts ordered by id, a page at a time
+      parameters:
+        - in: query
+          name: limit
+          schema:
+            type: integer
+          description: Maximum number of scripts to return, by default the
+            largest page the server allows
+        - in: query
+          name: cursor
+          schema:
+            type: string
+          description: The nextCursor of the previous page
+        - in: query
+          name: stream
+          schema:
+            type: boolean
+          description: Stream scripts as newline-delimited JSON
       responses:
         200:
           description: List scripts
@@ -32,11 +60,26 @@ def list_scripts() -> Tuple[Any, int]:
                     type: array
                     items:
                       $ref: '#/components/schemas/Script'
+                  nextCursor:
+                    type: string
+                    nullable: true
+            application/x-ndjson:
+              schema:
+                $ref: '#/components/schemas/Script'
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
     """
+    params = page_schema.load(request.args)
+    if wants_stream(params):
+        return stream_listing(scripts_crud, dump, params), 200
     with generate_session() as session:
-        raw_scripts = scripts_crud.get_entities(session)
-        scripts = [schema.dump(script) for script in raw_scripts]
-    result = {"result": scripts}
+        raw_scripts, next_cursor = scripts_crud.get_page(session, params)
+        with timed_serialization():
+            scripts = [dump(script) for script in raw_scripts]
+    result = {"result": scripts, "nextCursor": next_cursor}
     return jsonify(result), 200
 
 
@@ -62,15 +105,9 @@ def create_script() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_script = scripts_crud.create_entity(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_script = scripts_crud.create_entity(session, data)
         result = schema.dump(raw_script)
     return jsonify(result), 201
 
@@ -105,15 +142,9 @@ def create_script_bulk() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
     with generate_session() as session:
-        try:
-            raw_scripts = scripts_crud.create_entities(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_scripts = scripts_crud.create_entities(session, data)
         result = schema.dump(raw_scripts, many=True)
     return jsonify(result), 201
 
@@ -145,7 +176,7 @@ def get_script(script_id: str) -> Tuple[Any, int]:
             raw_script = scripts_crud.get_entity(session, int(script_id))
         except BotCIntegrityError:
             return "Resource not found", 404
-        result = schema.dump(raw_script)
+        result = dump(raw_script)
     return jsonify(result), 200
 
 
@@ -178,15 +209,9 @@ def update_script(script_id: str) -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_script = scripts_crud.update_entity(session, data, int(script_id))
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_script = scripts_crud.update_entity(session, data, int(script_id))
         result = schema.dump(raw_script)
     return jsonify(result), 200
 
@@ -235,15 +260,9 @@ def create_scripts_roles() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = scripts_roles_schema.load(cast(Mapping[str, Any], request.json))
-    except ValidationError as err:
-        return err.messages, 400
+    data = scripts_roles_schema.load(cast(Mapping[str, Any], request.json))
     with generate_session() as session:
-        try:
-            raw_scripts_roles = scripts_roles_crud.create_entity(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_scripts_roles = scripts_roles_crud.create_entity(session, data)
         result = schema.dump(raw_scripts_roles)
     return jsonify(result), 201
 
@@ -278,17 +297,11 @@ def create_scripts_roles_bulk() -> Tuple[Any, int]:
             application/json:
               schema: ValidationErrorSchema
     """
-    try:
-        data = scripts_roles_schema.load(
-            cast(List[Mapping[str, Any]], request.json), many=True
-        )
-    except ValidationError as err:
-        return err.messages, 400
+    data = scripts_roles_schema.load(
+        cast(List[Mapping[str, Any]], request.json), many=True
+    )
     with generate_session() as session:
-        try:
-            raw_scripts_roles = scripts_roles_crud.create_entities(session, data)
-        except BotCIntegrityError as err:
-            return err.messages, 400
+        raw_scripts_roles = scripts_roles_crud.create_entities(session, data)
         result = schema.dump(raw_scripts_roles, many=True)
     return jsonify({"result": result}), 201
 
@@ -327,19 +340,15 @@ def set_script_roles(script_id: str) -> Tuple[Any, int]:
         404:
           description: Script not found
     """
-    try:
-        data = role_schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
-    except ValidationError as err:
-        return err.messages, 400
+    data = role_schema.load(cast(List[Mapping[str, Any]], request.json), many=True)
     with generate_session() as session:
-        try:
-            scripts_roles_crud.create_entities_for_script(session, data, int(script_id))
-        except BotCIntegrityError as err:
-            return err.messages, 400
         try:
             raw_script = scripts_crud.get_entity(session, int(script_id))
         except BotCIntegrityError:
             return "Resource not found", 404
+        raw_script = scripts_roles_crud.create_entities_for_script(
+            session, data, raw_script.id
+        )
         result = schema.dump(raw_script)
     return jsonify(result), 200
 
@@ -347,12 +356,14 @@ def set_script_roles(script_id: str) -> Tuple[Any, int]:
 def create_router() -> Blueprint:
     """Router factory."""
     router = Blueprint("scripts", __name__, url_prefix="/scripts")
-    router.route("", methods=["GET"])(list_scripts)
+    router.route("", methods=["GET"])(conditional("scripts", "roles")(list_scripts))
     router.route("", methods=["POST"])(create_script)
     router.route("/bulk", methods=["POST"])(create_script_bulk)
     router.route("/roles", methods=["POST"])(create_scripts_roles)
     router.route("/roles/bulk", methods=["POST"])(create_scripts_roles_bulk)
-    router.route("/<script_id>", methods=["GET"])(get_script)
+    router.route("/<script_id>", methods=["GET"])(
+        conditional("scripts", "roles")(get_script)
+    )
     router.route("/<script_id>", methods=["PUT"])(update_script)
     router.route("/<script_id>", methods=["DELETE"])(delete_script)
     router.route("/<script_id>/roles", methods=["POST"])(set_script_roles)
@@ -0,0 +1,319 @@
+"""Statistics routes."""
+
+from typing import Any, Tuple
+
+from flask import Blueprint, jsonify, request
+
+from app.crud import stats_crud
+from app.database import generate_session
+from app.schemas import (
+    DrunkStatsSchema,
+    LocationStatsSchema,
+    PlayerCountStatsSchema,
+    RoleStatsFilterSchema,
+    RoleStatsSchema,
+    ScriptStatsSchema,
+    StatsFilterSchema,
+    TeamStatsSchema,
+)
+
+from ._conditional import conditional
+
+filter_schema = StatsFilterSchema()
+role_filter_schema = RoleStatsFilterSchema()
+role_stats_schema = RoleStatsSchema()
+team_stats_schema = TeamStatsSchema()
+script_stats_schema = ScriptStatsSchema()
+player_count_stats_schema = PlayerCountStatsSchema()
+location_stats_schema = LocationStatsSchema()
+drunk_stats_schema = DrunkStatsSchema()
+
+
+def get_role_stats() -> Tuple[Any, int]:
+    """Get wins and losses per role route.
+
+    ---
+    get:
+      description: Wins and losses per role, most played first
+      parameters:
+        - in: query
+          name: minPlayerCount
+          schema:
+            type: integer
+          description: Only count games with at least this many players
+        - in: query
+          name: scriptId
+          schema:
+            type: integer
+          description: Only count games played on this script
+        - in: query
+          name: isInPerson
+          schema:
+            type: boolean
+          description: Only count games played in person or online
+        - in: query
+          name: team
+          schema:
+            type: string
+            enum: [DEMON, MINION, OUTSIDER, TOWNSFOLK]
+          description: Only include roles of this team
+      responses:
+        200:
+          description: Wins and losses per role, most played first
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  result:
+                    type: array
+                    items: RoleStatsSchema
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
+    """
+    filters = role_filter_schema.load(request.args)
+    with generate_session() as session:
+        raw_stats = stats_crud.get_role_stats(session, filters)
+        result = role_stats_schema.dump(raw_stats, many=True)
+    return jsonify({"result": result}), 200
+
+
+def get_team_stats() -> Tuple[Any, int]:
+    """Get wins per alignment route.
+
+    ---
+    get:
+      description: Wins per alignment
+      parameters:
+        - in: query
+          name: minPlayerCount
+          schema:
+            type: integer
+          description: Only count games with at least this many players
+        - in: query
+          name: scriptId
+          schema:
+            type: integer
+          description: Only count games played on this script
+        - in: query
+          name: isInPerson
+          schema:
+            type: boolean
+          description: Only count games played in person or online
+      responses:
+        200:
+          description: Wins per alignment
+          content:
+            application/json:
+              schema: TeamStatsSchema
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
+    """
+    filters = filter_schema.load(request.args)
+    with generate_session() as session:
+        raw_stats = stats_crud.get_team_stats(session, filters)
+        result = team_stats_schema.dump(raw_stats)
+    return jsonify(result), 200
+
+
+def get_script_stats() -> Tuple[Any, int]:
+    """Get wins per alignment for each script route.
+
+    ---
+    get:
+      description: Wins per alignment for each script
+      parameters:
+        - in: query
+          name: minPlayerCount
+          schema:
+            type: integer
+          description: Only count games with at least this many players
+        - in: query
+          name: scriptId
+          schema:
+            type: integer
+          description: Only count games played on this script
+        - in: query
+          name: isInPerson
+          schema:
+            type: boolean
+          description: Only count games played in person or online
+      responses:
+        200:
+          description: Wins per alignment for each script
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  result:
+                    type: array
+                    items: ScriptStatsSchema
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
+    """
+    filters = filter_schema.load(request.args)
+    with generate_session() as session:
+        raw_stats = stats_crud.get_script_stats(session, filters)
+        result = script_stats_schema.dump(raw_stats, many=True)
+    return jsonify({"result": result}), 200
+
+
+def get_player_count_stats() -> Tuple[Any, int]:
+    """Get wins per alignment for each player count route.
+
+    ---
+    get:
+      description: Wins per alignment for each player count
+      parameters:
+        - in: query
+          name: minPlayerCount
+          schema:
+            type: integer
+          description: Only count games with at least this many players
+        - in: query
+          name: scriptId
+          schema:
+            type: integer
+          description: Only count games played on this script
+        - in: query
+          name: isInPerson
+          schema:
+            type: boolean
+          description: Only count games played in person or online
+      responses:
+        200:
+          description: Wins per alignment for each player count
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  result:
+                    type: array
+                    items: PlayerCountStatsSchema
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
+    """
+    filters = filter_schema.load(request.args)
+    with generate_session() as session:
+        raw_stats = stats_crud.get_player_count_stats(session, filters)
+        result = player_count_stats_schema.dump(raw_stats, many=True)
+    return jsonify({"result": result}), 200
+
+
+def get_location_stats() -> Tuple[Any, int]:
+    """Get wins per alignment by location route.
+
+    ---
+    get:
+      description: Wins per alignment online and in person
+      parameters:
+        - in: query
+          name: minPlayerCount
+          schema:
+            type: integer
+          description: Only count games with at least this many players
+        - in: query
+          name: scriptId
+          schema:
+            type: integer
+          description: Only count games played on this script
+        - in: query
+          name: isInPerson
+          schema:
+            type: boolean
+          description: Only count games played in person or online
+      responses:
+        200:
+          description: Wins per alignment online and in person
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  result:
+                    type: array
+                    items: LocationStatsSchema
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
+    """
+    filters = filter_schema.load(request.args)
+    with generate_session() as session:
+        raw_stats = stats_crud.get_location_stats(session, filters)
+        result = location_stats_schema.dump(raw_stats, many=True)
+    return jsonify({"result": result}), 200
+
+
+def get_drunk_stats() -> Tuple[Any, int]:
+    """Get roles seen by the drunk route.
+
+    ---
+    get:
+      description: How often the drunk saw each role, most seen first
+      parameters:
+        - in: query
+          name: minPlayerCount
+          schema:
+            type: integer
+          description: Only count games with at least this many players
+        - in: query
+          name: scriptId
+          schema:
+            type: integer
+          description: Only count games played on this script
+        - in: query
+          name: isInPerson
+          schema:
+            type: boolean
+          description: Only count games played in person or online
+      responses:
+        200:
+          description: How often the drunk saw each role, most seen first
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  result:
+                    type: array
+                    items: DrunkStatsSchema
+        400:
+          description: Failure due to invalid request
+          content:
+            application/json:
+              schema: ValidationErrorSchema
+    """
+    filters = filter_schema.load(request.args)
+    with generate_session() as session:
+        raw_stats = stats_crud.get_drunk_stats(session, filters)
+        result = drunk_stats_schema.dump(raw_stats, many=True)
+    return jsonify({"result": result}), 200
+
+
+def create_router() -> Blueprint:
+    """Router factory."""
+    router = Blueprint("stats", __name__, url_prefix="/stats")
+    cached = conditional("games", "roles", "scripts", "stats")
+    router.route("/roles", methods=["GET"])(cached(get_role_stats))
+    router.route("/teams", methods=["GET"])(cached(get_team_stats))
+    router.route("/scripts", methods=["GET"])(cached(get_script_stats))
+    router.route("/player-counts", methods=["GET"])(cached(get_player_count_stats))
+    router.route("/locations", methods=["GET"])(cached(get_location_stats))
+    router.route("/drunk", methods=["GET"])(cached(get_drunk_stats))
+    return router
@@ -1,8 +1,21 @@
 """Schemas."""
 
-from .game import GameSchema
+from ._compiled import compile_dump
+from .diagnostics import PoolStatusSchema
+from .game import GamePageSchema, GameSchema
 from .games_roles import GamesRolesSchema
 from .messages import ValidationErrorSchema
+from .pagination import PageSchema
 from .role import RoleSchema
 from .script import ScriptSchema
 from .scripts_roles import ScriptsRolesSchema
+from .stats import (
+    DrunkStatsSchema,
+    LocationStatsSchema,
+    PlayerCountStatsSchema,
+    RoleStatsFilterSchema,
+    RoleStatsSchema,
+    ScriptStatsSchema,
+    StatsFilterSchema,
+    TeamStatsSchema,
+)
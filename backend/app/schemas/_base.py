@@ -9,11 +9,15 @@ def camelcase(string: str) -> str:
     return next(parts) + "".join(i.title() for i in parts)
 
 
-class SchemaBase(Schema):
-    """Schema."""
+class CamelCaseSchema(Schema):
+    """Schema with camel case field names."""
 
     def on_bind_field(self, field_name: str, field_obj: fields.Field):
         """Convert field names from snake case to camel case."""
         field_obj.data_key = camelcase(field_obj.data_key or field_name)
 
+
+class SchemaBase(CamelCaseSchema):
+    """Schema."""
+
     id = fields.Integer(allow_none=True)
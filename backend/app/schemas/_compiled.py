@@ -0,0 +1,137 @@
+"""Compiled dump functions for schemas on hot read paths.
+
+Schema.dump resolves every field through its accessor and serialize methods, and
+a Pluck of a Nested schema builds a throwaway dict per item. compile_dump reads the
+bound fields of a schema once and generates a function that builds the same dict
+with plain attribute access, falling back to the field's own _serialize for any
+value not of the type it expects, so the output is always identical.
+"""
+
+import logging
+from itertools import count
+from typing import Any, Callable, Dict, List
+
+from marshmallow import Schema, fields, missing
+from marshmallow.utils import to_iso_date
+
+from app.config import COMPILED_DUMPS
+
+Dump = Callable[[Any], Any]
+
+EXACT_TYPES = {
+    fields.Integer: int,
+    fields.Float: float,
+    fields.String: str,
+    fields.Boolean: bool,
+}
+ISO_FORMATS = (None, "iso", "iso8601")
+
+
+class UnsupportedSchema(Exception):
+    """A schema whose dump cannot be compiled to an identical function."""
+
+
+class _Compiler:
+    """Generates the source of dump functions and the names they refer to."""
+
+    def __init__(self) -> None:
+        self.names: Dict[str, Any] = {"to_iso_date": to_iso_date}
+        self.functions: List[str] = []
+        self.compiled: Dict[int, str] = {}
+        self.counter = count()
+
+    def bind(self, value: Any, prefix: str) -> str:
+        """Make a value available to the generated code under a new name."""
+        name = f"{prefix}{next(self.counter)}"
+        self.names[name] = value
+        return name
+
+    def variable(self) -> str:
+        """Get a new local variable name."""
+        return f"v{next(self.counter)}"
+
+    def schema(self, schema: Schema) -> str:
+        """Generate the dump function of one object of a schema and return its name."""
+        if id(schema) in self.compiled:
+            return self.compiled[id(schema)]
+        hooks = schema._hooks  # pylint: disable=protected-access
+        if hooks["pre_dump"] or hooks["post_dump"]:
+            raise UnsupportedSchema(f"{type(schema).__name__} has dump hooks")
+        name = f"dump_{type(schema).__name__}_{next(self.counter)}"
+        self.compiled[id(schema)] = name
+        items = [
+            f"        {(field.data_key or attr)!r}: {self.field(field, attr, 'obj')},"
+            for attr, field in schema.dump_fields.items()
+        ]
+        self.functions.append(
+            "\n".join([f"def {name}(obj):", "    return {", *items, "    }"])
+        )
+        return name
+
+    def field(self, field: fields.Field, attr: str, obj: str) -> str:
+        """Generate the expression serializing a field of the object named obj."""
+        attribute = field.attribute or attr
+        if field.dump_default is not missing or not attribute.isidentifier():
+            raise UnsupportedSchema(f"{attr} is not a plain attribute")
+        var = self.variable()
+        value = f"({var} := {obj}.{attribute})"
+        fallback = f"{self.bind(field, 'field')}._serialize({var}, {attr!r}, {obj})"
+
+        field_type = type(field)
+        # Subclasses may override _serialize, so only stock fields are inlined
+        stock = field_type.__module__ == fields.__name__
+        if field_type in EXACT_TYPES and not getattr(field, "as_string", False):
+            type_name = EXACT_TYPES[field_type].__name__
+            return f"({var} if {value}.__class__ is {type_name} else {fallback})"
+        if stock and isinstance(field, fields.Date) and field.format in ISO_FORMATS:
+            return f"(None if {value} is None else to_iso_date({var}))"
+        if (
+            stock
+            and isinstance(field, fields.Enum)
+            and field.field.__class__ is fields.Raw
+        ):
+            member = "value" if field.by_value else "name"
+            return f"(None if {value} is None else {var}.{member})"
+        if stock and isinstance(field, fields.Nested):
+            return f"(None if {value} is None else {self.nested(field, attr, var)})"
+        if isinstance(field, (fields.Nested, fields.Method, fields.Function)):
+            raise UnsupportedSchema(f"{attr} is a {field_type.__name__} field")
+        return f"(None if {value} is None else {fallback})"
+
+    def nested(self, field: fields.Nested, attr: str, var: str) -> str:
+        """Generate the expression serializing the nested object named var."""
+        schema = field.schema
+        many = field.many or schema.many
+        if isinstance(field, fields.Pluck):
+            if len(schema.dump_fields) != 1:
+                raise UnsupportedSchema(f"{attr} plucks from an unsupported schema")
+            [(inner_attr, inner)] = schema.dump_fields.items()
+            if not many:
+                return self.field(inner, inner_attr, var)
+            item = self.variable()
+            return f"[{self.field(inner, inner_attr, item)} for {item} in {var}]"
+        dump = self.schema(schema)
+        return f"[{dump}(x) for x in {var}]" if many else f"{dump}({var})"
+
+
+def compile_dump(schema: Schema) -> Dump:
+    """Compile the dump of a schema instance into a function of one object.
+
+    The function returns what `schema.dump(obj)` returns for objects exposing the
+    schema's fields as attributes, such as model instances. Schema.dump itself is
+    returned when COMPILED_DUMPS is off or the schema uses a feature the compiler
+    does not reproduce, like dump hooks or defaults.
+    """
+    if not COMPILED_DUMPS or schema.many:
+        return schema.dump
+    compiler = _Compiler()
+    try:
+        name = compiler.schema(schema)
+    except UnsupportedSchema as err:
+        logging.warning(f"Not compiling {type(schema).__name__}: {err}")
+        return schema.dump
+    namespace = dict(compiler.names)
+    source = "\n\n".join(compiler.functions)
+    code = compile(source, f"<compiled {name}>", "exec")
+    exec(code, namespace)  # pylint: disable=exec-used
+    return namespace[name]
@@ -0,0 +1,24 @@
+"""Schemas for runtime diagnostics."""
+
+from marshmallow import fields
+
+from ._base import CamelCaseSchema
+
+
+class PoolStatusSchema(CamelCaseSchema):
+    """Schema for connection pool occupancy and checkout telemetry."""
+
+    pool = fields.String(allow_none=True)
+    size = fields.Integer()
+    checked_in = fields.Integer()
+    checked_out = fields.Integer()
+    overflow = fields.Integer()
+    max_overflow = fields.Integer()
+    timeout = fields.Float()
+    checkouts = fields.Integer()
+    timeouts = fields.Integer()
+    in_use = fields.Integer()
+    max_in_use = fields.Integer()
+    wait_total = fields.Float()
+    wait_max = fields.Float()
+    wait_mean = fields.Float()
@@ -6,6 +6,7 @@ from app.models import Alignment
 
 from ._base import SchemaBase
 from .games_roles import GamesRolesSchema
+from .pagination import PageSchema
 
 
 class GameSchema(SchemaBase):
@@ -19,3 +20,15 @@ class GameSchema(SchemaBase):
     script_id = fields.Integer()
     roles = fields.Pluck(GamesRolesSchema, "role", many=True, dump_only=True)
     drunk_saw_role_id = fields.Integer(allow_none=True)
+
+
+class GamePageSchema(PageSchema):
+    """Schema for game list query parameters."""
+
+    script_id = fields.Integer(load_default=None)
+    winning_team = fields.Enum(Alignment, by_value=True, load_default=None)
+    is_in_person = fields.Boolean(load_default=None)
+    min_player_count = fields.Integer(load_default=None)
+    max_player_count = fields.Integer(load_default=None)
+    date_from = fields.Date(load_default=None)
+    date_to = fields.Date(load_default=None)
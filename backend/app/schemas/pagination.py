@@ -0,0 +1,17 @@
+"""Schemas for paginated list query parameters."""
+
+from marshmallow import fields, validate
+
+from app.config import MAX_PAGE_SIZE
+
+from ._base import CamelCaseSchema
+
+
+class PageSchema(CamelCaseSchema):
+    """Schema for pagination and streaming query parameters."""
+
+    limit = fields.Integer(
+        validate=validate.Range(min=1, max=MAX_PAGE_SIZE), load_default=MAX_PAGE_SIZE
+    )
+    cursor = fields.String(load_default=None)
+    stream = fields.Boolean(load_default=False)
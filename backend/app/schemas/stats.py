@@ -0,0 +1,65 @@
+"""Schemas for aggregated game statistics."""
+
+from marshmallow import fields
+
+from app.models import RoleType
+
+from ._base import CamelCaseSchema
+
+
+class StatsFilterSchema(CamelCaseSchema):
+    """Schema for statistics query parameters."""
+
+    min_player_count = fields.Integer(load_default=None)
+    script_id = fields.Integer(load_default=None)
+    is_in_person = fields.Boolean(load_default=None)
+
+
+class RoleStatsFilterSchema(StatsFilterSchema):
+    """Schema for role statistics query parameters."""
+
+    team = fields.Enum(RoleType, by_value=True, load_default=None)
+
+
+class RoleStatsSchema(CamelCaseSchema):
+    """Schema for wins and losses of a role."""
+
+    role_id = fields.Integer()
+    name = fields.String()
+    team = fields.Enum(RoleType, by_value=True)
+    wins = fields.Integer()
+    losses = fields.Integer()
+
+
+class TeamStatsSchema(CamelCaseSchema):
+    """Schema for wins per alignment."""
+
+    evil = fields.Integer()
+    good = fields.Integer()
+
+
+class ScriptStatsSchema(TeamStatsSchema):
+    """Schema for wins per alignment of a script."""
+
+    script_id = fields.Integer()
+    name = fields.String()
+
+
+class PlayerCountStatsSchema(TeamStatsSchema):
+    """Schema for wins per alignment at a player count."""
+
+    player_count = fields.Integer()
+
+
+class LocationStatsSchema(TeamStatsSchema):
+    """Schema for wins per alignment online or in person."""
+
+    is_in_person = fields.Boolean()
+
+
+class DrunkStatsSchema(CamelCaseSchema):
+    """Schema for how often the drunk saw a role."""
+
+    role_id = fields.Integer()
+    name = fields.String()
+    games = fields.Integer()
@@ -1,13 +1,60 @@
-"""API Spec."""
+"""API Spec.
 
-from apispec.ext.marshmallow import MarshmallowPlugin
-from apispec_webframeworks.flask import FlaskPlugin
-from flasgger import APISpec, Swagger
-from flask import Flask
+flasgger and apispec are only imported once the spec is generated or the
+Swagger UI is opened, so they cost nothing at worker boot.
+"""
 
+import copy
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from flask import Blueprint, Flask, jsonify, redirect, render_template, url_for
+from werkzeug.routing import Rule
+
+from app import schemas
+
+if TYPE_CHECKING:
+    from flasgger import APISpec, Swagger
+
+FINGERPRINT_KEY = "x-fingerprint"
+
+SWAGGER_CONFIG: Dict[str, Any] = {
+    "headers": [],
+    "specs_route": "/api",
+    "endpoint": "flasgger",
+    "specs": [
+        {
+            "endpoint": "apispec",
+            "route": "/apispec.json",
+            "model_filter": lambda tag: True,
+        }
+    ],
+}
+
+
+def api_rules(app: Any) -> List[Rule]:
+    """Get the URL rules of the app's own views, leaving out flasgger's."""
+    return [
+        rule
+        for rule in app.url_map.iter_rules()
+        if rule.endpoint.partition(".")[0] != "flasgger"
+    ]
+
+
+def build_spec(app: Any) -> "APISpec":
+    """Build the API spec from the docstrings of the app's views.
+
+    Only Flask's routing interface is used, so the async app is accepted too.
+    """
+    # pylint: disable=import-outside-toplevel
+    from apispec.ext.marshmallow import MarshmallowPlugin
+    from apispec_webframeworks.flask import FlaskPlugin
+    from flasgger import APISpec
 
-def serve_spec(app: Flask):
-    """Generate and serve the API spec."""
     spec = APISpec(
         title="Holocron",
         version="0.1",
@@ -17,28 +64,118 @@ def serve_spec(app: Flask):
             MarshmallowPlugin(),
         ],
     )
+    for rule in api_rules(app):
+        spec.path(view=app.view_functions[rule.endpoint], app=app)
+    return spec
+
+
+def spec_fingerprint(app: Flask) -> str:
+    """Hash everything the spec is built from, without building it.
+
+    That is the URL rules, the docstrings of their views, the source of the
+    schemas and the OpenAPI version, so an artifact generated from an older tree
+    is never served.
+    """
+    digest = hashlib.sha256(app.config["SWAGGER"]["openapi"].encode())
+    for rule in sorted(api_rules(app), key=lambda rule: rule.endpoint):
+        view = app.view_functions[rule.endpoint]
+        methods = ",".join(sorted(rule.methods or ()))
+        digest.update(f"{rule.rule} {methods} {rule.endpoint}\n".encode())
+        digest.update((view.__doc__ or "").encode())
+    schemas_dir = os.path.dirname(schemas.__file__)
+    for name in sorted(os.listdir(schemas_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(schemas_dir, name), "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def get_swagger(app: Flask) -> "Swagger":
+    """Get the flasgger extension of the app, creating it on first use.
 
+    It is never initialized on the app, since serve_spec registers its views.
+    """
+    if "flasgger" not in app.extensions:
+        # pylint: disable-next=import-outside-toplevel
+        from flasgger import Swagger
+
+        swagger = Swagger(config=copy.deepcopy(SWAGGER_CONFIG))
+        swagger.app = app
+        swagger.load_config(app)
+        app.extensions["flasgger"] = swagger
+    return app.extensions["flasgger"]
+
+
+def generate_spec(app: Flask) -> Dict[str, Any]:
+    """Build the spec exactly as flasgger serves it, stamped with its fingerprint."""
+    swagger = get_swagger(app)
+    swagger.template = build_spec(app).to_flasgger(app)
     with app.test_request_context():
-        for rule in app.url_map.iter_rules():
-            spec.path(view=app.view_functions[rule.endpoint])
+        spec = dict(swagger.get_apispecs("apispec"))
+    spec[FINGERPRINT_KEY] = spec_fingerprint(app)
+    return spec
+
+
+def load_spec(app: Flask, path: str) -> Optional[Dict[str, Any]]:
+    """Load the spec artifact if it exists and matches the app."""
+    try:
+        with open(path, "rb") as file:
+            spec = json.load(file)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logging.warning(f"Ignoring unreadable API spec {path}")
+        return None
+    if spec.get(FINGERPRINT_KEY) != spec_fingerprint(app):
+        logging.warning(f"Ignoring outdated API spec {path}")
+        return None
+    return spec
+
+
+def serve_spec(app: Flask):
+    """Serve the API spec and Swagger UI with flasgger's files and views.
 
-    template = spec.to_flasgger(
-        app,
+    The spec is loaded here from the artifact at SPEC_FILE, written by
+    `flask spec generate`. Without a current one, it is built once on the first
+    request for it, so neither worker boot nor any other route pays for parsing
+    route docstrings.
+
+    The UI templates and static files are found where the flasgger release pinned
+    in pyproject.toml keeps them; tests/test_spec.py loads the UI and its assets.
+    """
+    flasgger_spec = importlib.util.find_spec("flasgger")
+    if flasgger_spec is None or flasgger_spec.origin is None:
+        raise ModuleNotFoundError("No module named 'flasgger'", name="flasgger")
+    ui_folder = os.path.join(os.path.dirname(flasgger_spec.origin), "ui3")
+    blueprint = Blueprint(
+        SWAGGER_CONFIG["endpoint"],
+        __name__,
+        template_folder=os.path.join(ui_folder, "templates"),
+        static_folder=os.path.join(ui_folder, "static"),
+        static_url_path=app.config["SWAGGER"]["static_url_path"],
     )
-    swagger_config = {
-        "headers": [],
-        "specs_route": "/api",
-        "endpoint": "flasgger",
-        "specs": [
-            {
-                "endpoint": "apispec",
-                "route": "/apispec.json",
-                "model_filter": lambda tag: True,
-            }
-        ],
-    }
-    Swagger(
-        app,
-        template=template,
-        config=swagger_config,
+    cache = {"spec": load_spec(app, app.config["SPEC_FILE"])}
+
+    def apispec() -> Any:
+        if cache["spec"] is None:
+            cache["spec"] = generate_spec(app)
+        return jsonify(cache["spec"])
+
+    def apidocs() -> Any:
+        # pylint: disable-next=import-outside-toplevel
+        from flasgger.base import APIDocsView
+
+        return APIDocsView(view_args={"config": get_swagger(app).config}).get()
+
+    def oauth_redirect() -> Any:
+        return render_template(["flasgger/oauth2-redirect.html", "flasgger/o2c.html"])
+
+    blueprint.add_url_rule(SWAGGER_CONFIG["specs_route"], "apidocs", apidocs)
+    blueprint.add_url_rule("/oauth2-redirect.html", "oauth_redirect", oauth_redirect)
+    blueprint.add_url_rule(
+        "/apidocs/index.html",
+        "apidocs_index",
+        lambda: redirect(url_for("flasgger.apidocs")),
     )
+    blueprint.add_url_rule(SWAGGER_CONFIG["specs"][0]["route"], "apispec", apispec)
+    app.register_blueprint(blueprint)
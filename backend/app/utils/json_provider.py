@@ -0,0 +1,84 @@
+"""JSON provider using orjson when it is installed."""
+
+import json
+import logging
+from datetime import date
+from enum import Enum
+from types import ModuleType
+from typing import Any, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+from app.config import JSON_BACKEND
+from app.utils.timing import timed_serialization
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding and decoding with orjson, or else json.
+
+    Enums are serialized to their value, and dates and datetimes to ISO 8601
+    strings, by both backends; Flask's provider would fail on the former and
+    use HTTP dates for the latter. orjson writes UTF-8 rather than ASCII
+    escapes and compact output, keys still sorted. Calls passing json.dumps or
+    json.loads arguments orjson does not take go through json.
+    """
+
+    def __init__(self, app: Any):
+        """Pick the backend from JSON_BACKEND: auto, orjson or json."""
+        super().__init__(app)
+        self.orjson: Any = orjson if JSON_BACKEND in ("auto", "orjson") else None
+        if JSON_BACKEND == "orjson" and orjson is None:
+            logging.warning("orjson is not installed, using the json module")
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        """Serialize the types neither backend handles natively."""
+        if isinstance(o, Enum):
+            return o.value
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def options(self, indent: bool = False) -> int:
+        """Get the orjson options matching the provider's settings."""
+        option = self.orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= self.orjson.OPT_SORT_KEYS
+        if indent:
+            option |= self.orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON to a string."""
+        with timed_serialization():
+            if self.orjson is None or kwargs:
+                return super().dumps(obj, **kwargs)
+            return self.orjson.dumps(
+                obj, default=self.default, option=self.options()
+            ).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize data as JSON from a string or bytes."""
+        if self.orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return self.orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        """Serialize the arguments as JSON straight to the bytes of a response."""
+        if self.orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        with timed_serialization():
+            body = self.orjson.dumps(
+                obj,
+                default=self.default,
+                option=self.options(indent) | self.orjson.OPT_APPEND_NEWLINE,
+            )
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -1,12 +1,23 @@
-"""Logging python module."""
+"""Logging python module.
 
+Records are put on a queue by the thread that logs them and written to stdout
+and stderr by a listener thread, so a slow stream never blocks a request.
+"""
+
+import atexit
+import json
 import logging
-import logging.config
+import logging.handlers
+import os
+import queue
 import sys
+from typing import Any, Dict, Optional
+
+from app.config import LOG_FORMAT
 
 
 class StreamFormatter(logging.Formatter):
-    """Logging Formatter to add colors and count warning / errors."""
+    """Logging Formatter to add colors per level."""
 
     GREY = "\x1b[38;21m"
     GREEN = "\x1b[1;32m"
@@ -24,42 +35,113 @@ class StreamFormatter(logging.Formatter):
         logging.CRITICAL: BOLD_RED + MSG_FORMAT + RESET,
     }
 
+    def __init__(self) -> None:
+        """Build the formatter of each level once."""
+        super().__init__(self.MSG_FORMAT)
+        self.formatters = {
+            level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()
+        }
+
     def format(self, record: logging.LogRecord) -> str:
         """Format the stream output."""
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
-
-
-class LevelHandler(logging.StreamHandler):
-    """Custom handler to pick sys.stdout or sys.stderr based on record level."""
-
-    def emit(self, record: logging.LogRecord):
-        """Extend logging.StreamHandler to pick stream based on record level."""
-        if record.levelno in (logging.ERROR, logging.CRITICAL, logging.WARNING):
-            self.stream = sys.stderr
-        else:
-            self.stream = sys.stdout
-        logging.StreamHandler.emit(self, record)
-
-
-logging_conf = {
-    "version": 1,
-    "formatters": {
-        "stream": {"()": StreamFormatter},
-    },
-    "handlers": {
-        "stream": {
-            "()": LevelHandler,
-            "level": "INFO",
-            "formatter": "stream",
-        },
-    },
-    "loggers": {
-        "root": {"level": "INFO", "handlers": ["stream"]},
-    },
-    "root": {"level": "DEBUG", "handlers": ["stream"]},
-    "disable_existing_loggers": False,
-}
-
-logging.config.dictConfig(logging_conf)
+        formatter = self.formatters.get(record.levelno)
+        return formatter.format(record) if formatter else super().format(record)
+
+
+class JSONFormatter(logging.Formatter):
+    """Logging Formatter writing each record as a single line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format the record as a JSON object."""
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class BelowWarningFilter(logging.Filter):
+    """Let through records below WARNING, which go to stdout."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Check the level of the record."""
+        return record.levelno < logging.WARNING
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler leaving all formatting to the listener thread.
+
+    Only the message is merged with its arguments, so that later changes to them
+    do not show up in the log. The record itself is queued, not a copy, since
+    the queue is the root logger's only handler.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message with its arguments."""
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LogPipeline:
+    """Listener writing the records queued by the root logger's handler."""
+
+    def __init__(self) -> None:
+        """Initialize without a listener."""
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        """Route the root logger's records through a queue to the streams."""
+        self.stop()
+        formatter: logging.Formatter = (
+            JSONFormatter() if LOG_FORMAT == "json" else StreamFormatter()
+        )
+        stdout = logging.StreamHandler(sys.stdout)
+        stdout.setLevel(logging.INFO)
+        stdout.addFilter(BelowWarningFilter())
+        stderr = logging.StreamHandler(sys.stderr)
+        stderr.setLevel(logging.WARNING)
+        for stream in (stdout, stderr):
+            stream.setFormatter(formatter)
+
+        records: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(QueueHandler(records))
+        # records below INFO are dropped before they are queued
+        root.setLevel(logging.INFO)
+        self.listener = logging.handlers.QueueListener(
+            records, stdout, stderr, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Write the records still queued and stop the listener."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def restart_in_child(self) -> None:
+        """Give a forked process its own queue and listener.
+
+        The listener thread of the parent does not survive the fork, and its
+        queue may have been in use by another thread when it happened.
+        """
+        if self.listener is not None:
+            self.listener = None
+            self.start()
+
+
+log_pipeline = LogPipeline()
+atexit.register(log_pipeline.stop)
+os.register_at_fork(after_in_child=log_pipeline.restart_in_child)
+
+
+def configure_logging() -> None:
+    """Send log records to stdout and stderr, colored or as JSON per LOG_FORMAT."""
+    log_pipeline.start()
@@ -0,0 +1,120 @@
+"""Prometheus metrics, when prometheus_client is installed.
+
+Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR and
+a scrape served by any worker aggregates those of all of them. Counters and
+histograms add up across workers; pool gauges are summed over live workers.
+Cache hit ratios are derived from the hit and miss counters, e.g.
+`rate(botc_cache_lookups_total{result="hit"}[5m])` over the rate of all lookups.
+"""
+
+import os
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple
+
+prometheus_client: Optional[ModuleType]
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+from app.utils.timing import RequestTimings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_STATS = (
+    "size",
+    "checked_in",
+    "checked_out",
+    "overflow",
+    "checkouts",
+    "timeouts",
+    "wait_total",
+)
+
+metrics: Dict[str, Any] = {}
+if prometheus_client is not None:
+    metrics = {
+        "requests": prometheus_client.Counter(
+            "botc_http_requests",
+            "HTTP requests handled.",
+            ["method", "route", "status"],
+        ),
+        "latency": prometheus_client.Histogram(
+            "botc_http_request_duration_seconds",
+            "Time to handle an HTTP request, up to its first byte.",
+            ["method", "route"],
+            buckets=LATENCY_BUCKETS,
+        ),
+        "db": prometheus_client.Histogram(
+            "botc_http_request_db_seconds",
+            "Time an HTTP request spent executing database statements.",
+            ["method", "route"],
+            buckets=LATENCY_BUCKETS,
+        ),
+        "errors": prometheus_client.Counter(
+            "botc_http_request_errors",
+            "HTTP requests rejected with a BotCIntegrityError or ValidationError.",
+            ["method", "route", "error"],
+        ),
+        "cache": prometheus_client.Counter(
+            "botc_cache_lookups",
+            "Lookups of the in-process caches.",
+            ["cache", "result"],
+        ),
+        "pool": prometheus_client.Gauge(
+            "botc_db_pool",
+            "Connection pool occupancy and checkout telemetry.",
+            ["stat"],
+            multiprocess_mode="livesum",
+        ),
+    }
+
+
+def observe_request(
+    method: str, route: str, status: int, timings: RequestTimings
+) -> None:
+    """Count a handled request and observe its latency and database time."""
+    if not metrics:
+        return
+    metrics["requests"].labels(method, route, status).inc()
+    metrics["latency"].labels(method, route).observe(timings.elapsed())
+    metrics["db"].labels(method, route).observe(timings.db)
+
+
+def count_rejection(method: str, route: str, error: str) -> None:
+    """Count a request rejected with an error of the given type."""
+    if metrics:
+        metrics["errors"].labels(method, route, error).inc()
+
+
+def observe_pool(status: Dict[str, Any]) -> None:
+    """Set the pool gauges from the pool status of this process."""
+    if not metrics:
+        return
+    for stat in POOL_STATS:
+        if stat in status:
+            metrics["pool"].labels(stat).set(status[stat])
+
+
+def count_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a hit or a miss of an in-process cache."""
+    if metrics:
+        metrics["cache"].labels(cache, "hit" if hit else "miss").inc()
+
+
+def exposition() -> Optional[Tuple[bytes, str]]:
+    """Render the metrics of every worker in the text exposition format.
+
+    None is returned when prometheus_client is not installed.
+    """
+    if prometheus_client is None:
+        return None
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return (
+        prometheus_client.generate_latest(registry),
+        prometheus_client.CONTENT_TYPE_LATEST,
+    )
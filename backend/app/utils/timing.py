@@ -0,0 +1,177 @@
+"""Per-request timing of database statements and serialization.
+
+Statements slower than SLOW_QUERY_MS are logged, in or out of a request. A
+request running the same statement more than N_PLUS_ONE_THRESHOLD times, like
+lazy loads of a relationship for each entity of a list, is logged as an N+1
+query, or fails with NPlusOneError when N_PLUS_ONE_RAISE is set, as in tests.
+Batches of an executemany and statements executed with the `bulk` execution
+option, like the chunks of a bulk insert, are not checked.
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from app.config import N_PLUS_ONE_RAISE, N_PLUS_ONE_THRESHOLD, SLOW_QUERY_MS
+from app.exceptions import NPlusOneError
+
+MAX_STATEMENT_LENGTH = 1000
+
+
+class RequestTimings:
+    """Durations accumulated while a request is handled, in seconds.
+
+    Database time is the time spent executing statements, counted by engine
+    events of every engine, including the sync engine behind an async one.
+    Serialization time is the time spent dumping the entities of list routes and
+    encoding JSON with the app's provider.
+    """
+
+    def __init__(self, route: str) -> None:
+        """Start timing a request to a route now."""
+        self.route = route
+        self.start = perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.serialize = 0.0
+        self.size = 0
+        self.statements: Optional[Counter[str]] = Counter()
+
+    def elapsed(self) -> float:
+        """Get the time since the request started."""
+        return perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Format the timings as a Server-Timing header value, in milliseconds."""
+        return (
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serialize * 1000:.1f}, "
+            f"total;dur={self.elapsed() * 1000:.1f}"
+        )
+
+    def summary(self) -> str:
+        """Format the timings and response size for a log line."""
+        return (
+            f"{self.elapsed() * 1000:.1f} ms"
+            f" - db {self.db * 1000:.1f} ms / {self.queries} queries"
+            f" - serialize {self.serialize * 1000:.1f} ms"
+            f" - {self.size} B"
+        )
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+def start_timings(route: str) -> RequestTimings:
+    """Start timing the request handled in the current context."""
+    timings = RequestTimings(route)
+    current_timings.set(timings)
+    return timings
+
+
+def end_timings() -> None:
+    """Stop attributing statements to the request of the current context."""
+    current_timings.set(None)
+
+
+def allow_repeated_statements() -> None:
+    """Stop checking the current request for N+1 queries.
+
+    For routes that run a statement repeatedly by design, like a listing
+    streamed a batch at a time.
+    """
+    timings = current_timings.get()
+    if timings is not None:
+        timings.statements = None
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Add the time spent in the block to the serialization time of the request."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialize += perf_counter() - start
+
+
+def count_bytes(timings: RequestTimings, chunks: Iterable[Any]) -> Iterator[Any]:
+    """Add the size of the chunks of a streamed body to the response size."""
+    for chunk in chunks:
+        timings.size += len(chunk.encode() if isinstance(chunk, str) else chunk)
+        yield chunk
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> str:
+    """Describe the types of bound parameters without their values."""
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {parameter_shape(rows[0], False)}" if rows else "[]"
+    if isinstance(parameters, Mapping):
+        types = [f"{key}: {type(value).__name__}" for key, value in parameters.items()]
+    else:
+        types = [type(value).__name__ for value in parameters or ()]
+    if len(types) > 10:
+        return f"{len(types)} parameters"
+    return f"({', '.join(types)})"
+
+
+def check_repeats(timings: RequestTimings, statement: str) -> None:
+    """Flag a request running the same statement once too many times."""
+    if timings.statements is None or N_PLUS_ONE_THRESHOLD <= 0:
+        return
+    timings.statements[statement] += 1
+    if timings.statements[statement] == N_PLUS_ONE_THRESHOLD + 1:
+        message = (
+            f"N+1 query in {timings.route}, run more than"
+            f" {N_PLUS_ONE_THRESHOLD} times: {statement[:MAX_STATEMENT_LENGTH]}"
+        )
+        if N_PLUS_ONE_RAISE:
+            raise NPlusOneError(message)
+        logging.warning(message)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query(conn: Connection, *_: Any) -> None:
+    """Note when a statement starts executing."""
+    conn.info["query_start"] = perf_counter()
+
+
+# pylint: disable-next=too-many-arguments
+@event.listens_for(Engine, "after_cursor_execute")
+def end_query(
+    conn: Connection,
+    _cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    """Log a slow statement and add it to the timings of its request."""
+    elapsed = perf_counter() - conn.info.pop("query_start", perf_counter())
+    timings = current_timings.get()
+    if 0 < SLOW_QUERY_MS <= elapsed * 1000:
+        route = timings.route if timings is not None else "no request"
+        statement_line = " ".join(statement.split())[:MAX_STATEMENT_LENGTH]
+        logging.warning(
+            f"Slow query in {route}, {elapsed * 1000:.1f} ms: {statement_line}"
+            f" - {parameter_shape(parameters, executemany)}"
+        )
+    if timings is None:
+        return
+    timings.db += elapsed
+    timings.queries += 1
+    if not executemany and not context.execution_options.get("bulk"):
+        check_repeats(timings, statement)
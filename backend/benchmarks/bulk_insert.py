@@ -0,0 +1,106 @@
+"""Benchmark the bulk game insert against the per-row refresh path it replaced.
+
+Run from the backend directory:
+
+    python -m benchmarks.bulk_insert --rows 10000
+    BULK_COPY=true python -m benchmarks.bulk_insert --url postgresql://...
+
+An in-memory SQLite database is used unless a URL is given. The benchmark inserts
+and then deletes its own games, so only point it at a scratch database.
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.crud import games_crud, scripts_crud, stats_crud
+from app.models import Alignment, Game, MetadataBase, Script
+
+FIRST_ID = 1_000_000
+
+
+def game_rows(count: int, script_id: int, first_id: int) -> List[Dict[str, Any]]:
+    """Build loaded game schema dicts with explicit ids, as a dump restore sends."""
+    return [
+        {
+            "player_count": 5 + index % 11,
+            "date": datetime(2020, 1, 1) + timedelta(hours=index),
+            "is_in_person": index % 2 == 0,
+            "notes": f"benchmark game {index}",
+            "winning_team": Alignment.GOOD if index % 3 else Alignment.EVIL,
+            "script_id": script_id,
+            "id": first_id + index,
+            "drunk_saw_role_id": None,
+        }
+        for index in range(count)
+    ]
+
+
+def legacy_insert(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert games the way the bulk routes did before: add, commit, refresh."""
+    games = [Game(**row) for row in rows]
+    session.add_all(games)
+    session.commit()
+    games_crud.reset_sequence(session)
+    for game in games:
+        session.refresh(game)
+
+
+def bulk_insert(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert games through the current bulk path."""
+    games_crud.create_entities(session, rows)
+
+
+def measure(
+    engine: Engine,
+    insert: Callable[[Session, List[Dict[str, Any]]], None],
+    rows: List[Dict[str, Any]],
+) -> float:
+    """Time one insert and return rows per second, deleting the games afterwards."""
+    with Session(engine, expire_on_commit=False) as session:
+        start = time.perf_counter()
+        insert(session, rows)
+        elapsed = time.perf_counter() - start
+    with Session(engine) as session:
+        session.execute(delete(Game).where(Game.id >= FIRST_ID))
+        session.commit()
+        stats_crud.rebuild(session)
+    return len(rows) / elapsed
+
+
+def get_script_id(engine: Engine) -> int:
+    """Get the id of any script, creating one on an empty database."""
+    with Session(engine) as session:
+        script_id = session.scalar(select(func.min(Script.id)))
+        if script_id is None:
+            script_id = scripts_crud.insert_row(session, {"name": "Benchmark"}).id
+            session.commit()
+    return script_id
+
+
+def main() -> None:
+    """Run the benchmark and print rows per second for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite://", help="database URL")
+    parser.add_argument("--rows", type=int, default=10_000, help="games to insert")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if engine.dialect.name == "sqlite":
+        MetadataBase.metadata.create_all(engine)
+    rows = game_rows(args.rows, get_script_id(engine), FIRST_ID)
+
+    before = measure(engine, legacy_insert, rows)
+    after = measure(engine, bulk_insert, rows)
+    print(f"{args.rows} games on {engine.dialect.name}")
+    print(f"before: {before:10.0f} rows/s")
+    print(f"after:  {after:10.0f} rows/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
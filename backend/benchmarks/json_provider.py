@@ -0,0 +1,66 @@
+"""Benchmark the orjson provider against Flask's json module provider.
+
+Run from the backend directory:
+
+    python -m benchmarks.json_provider --games 5000
+
+Responses are encoded from a large game list, dumped the way the list route
+dumps it, and a large bulk game payload is decoded as request.json would.
+"""
+
+import argparse
+import timeit
+from typing import Any, Callable, List, Tuple
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.schemas import GameSchema, compile_dump
+from app.utils.json_provider import JSONProvider
+from benchmarks.serializers import build_games, build_roles
+
+Operation = Callable[[DefaultJSONProvider], Any]
+
+
+def measure(operation: Operation, provider: DefaultJSONProvider, number: int) -> float:
+    """Time an operation with a provider and return milliseconds per call."""
+    return timeit.timeit(lambda: operation(provider), number=number) / number * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print the time of each operation per backend."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=5000, help="games per payload")
+    parser.add_argument("--roles", type=int, default=12, help="roles per game")
+    parser.add_argument("--number", type=int, default=10, help="calls to time")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = JSONProvider(app)
+    if fast.orjson is None:
+        raise SystemExit("orjson is not installed")
+
+    dump = compile_dump(GameSchema())
+    games = [dump(game) for game in build_games(args.games, build_roles(args.roles))]
+    listing = {"result": games, "nextCursor": None}
+    payload = stdlib.dumps([{**game, "roles": []} for game in games]).encode()
+    if fast.loads(fast.dumps(listing)) != stdlib.loads(stdlib.dumps(listing)):
+        raise SystemExit("The providers encode the game list differently")
+
+    cases: List[Tuple[str, Operation]] = [
+        (f"encode {args.games} games", lambda provider: provider.response(listing)),
+        (f"decode {args.games} games", lambda provider: provider.loads(payload)),
+    ]
+    print(f"{len(payload) / 1024:.0f} KiB bulk payload")
+    for name, operation in cases:
+        before = measure(operation, stdlib, args.number)
+        after = measure(operation, fast, args.number)
+        print(
+            f"{name:<20} json: {before:8.1f} ms"
+            f"  orjson: {after:8.1f} ms ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
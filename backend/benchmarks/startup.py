@@ -0,0 +1,93 @@
+"""Benchmark cold start: the import cost of each module and the app factory time.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --module app.models --runs 10
+
+Every run is a fresh interpreter started with `python -X importtime`, which imports
+the module and, unless --no-factory is given, calls its create_app. Medians over
+the runs are reported, with the packages whose modules took longest to import.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+SCRIPT = """
+import importlib, sys, time
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+if sys.argv[2] == "1":
+    module.create_app()
+print(f"startup {imported - start} {time.perf_counter() - imported}", file=sys.stderr)
+"""
+
+
+def run_once(module: str, factory: bool) -> Tuple[float, float, Dict[str, int]]:
+    """Start one interpreter and measure it.
+
+    Returns the import and factory seconds, and the microseconds spent importing
+    each top-level package, its submodules included.
+    """
+    env = dict(os.environ, DB_HOST=os.environ.get("DB_HOST", "localhost"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT, module, str(int(factory))],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    packages: Dict[str, int] = defaultdict(int)
+    import_seconds = factory_seconds = 0.0
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, name = line.removeprefix("import time:").split("|")
+            if self_us.strip().isdigit():
+                packages[name.strip().split(".")[0]] += int(self_us)
+        elif line.startswith("startup "):
+            _, import_time, factory_time = line.split()
+            import_seconds, factory_seconds = float(import_time), float(factory_time)
+    return import_seconds, factory_seconds, packages
+
+
+def main() -> None:
+    """Run the benchmark and print the startup budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app", help="module to import")
+    parser.add_argument("--runs", type=int, default=5, help="interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="modules to list")
+    parser.add_argument(
+        "--no-factory", action="store_true", help="do not call create_app"
+    )
+    args = parser.parse_args()
+
+    imports: List[float] = []
+    factories: List[float] = []
+    modules: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        import_seconds, factory_seconds, packages = run_once(
+            args.module, not args.no_factory
+        )
+        imports.append(import_seconds)
+        factories.append(factory_seconds)
+        for name, microseconds in packages.items():
+            modules[name].append(microseconds)
+
+    print(f"import {args.module}: {statistics.median(imports) * 1000:.1f} ms")
+    if not args.no_factory:
+        print(f"create_app: {statistics.median(factories) * 1000:.1f} ms")
+    print(f"\n{'ms':>8}  package")
+    costs = {name: statistics.median(times) for name, times in modules.items()}
+    slowest = sorted(costs.items(), key=lambda item: item[1], reverse=True)
+    for name, cost in slowest[: args.top]:
+        print(f"{cost / 1000:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
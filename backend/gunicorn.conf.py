@@ -0,0 +1,98 @@
+"""Gunicorn configuration, picked by the SERVER_PROFILE environment variable.
+
+The image sets the prod profile, while docker-compose and bare runs use dev. The
+dev profile runs a single sync worker that reloads on code changes. The prod
+profile sizes threaded or gevent workers from the CPU count, preloads the app and
+recycles workers after a jittered number of requests. Either way, workers write
+their metrics to PROMETHEUS_MULTIPROC_DIR, emptied when the server starts, so
+that they are aggregated across workers. For gevent workers, the standard library
+and psycopg2 are patched as soon as this file is loaded.
+"""
+
+# gunicorn reads its settings from lowercase module attributes
+# pylint: disable=invalid-name
+
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+SERVER_PROFILE = os.environ.get("SERVER_PROFILE", "dev")
+CPU_COUNT = multiprocessing.cpu_count()
+
+if SERVER_PROFILE == "prod":
+    worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+else:
+    worker_class = "sync"
+
+if worker_class == "gevent":
+    # patched in the master, before the app is preloaded, so that the pool and
+    # the locks the app creates yield to the event loop; the gevent worker only
+    # patches itself after post_fork
+    # pylint: disable-next=import-error
+    from gevent import monkey
+
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        logging.warning("psycogreen is not installed, queries block gevent workers")
+    else:
+        patch_psycopg()
+
+# set before the app, and with it prometheus_client, is imported
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "botc-metrics")
+)
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8080")
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+if SERVER_PROFILE == "prod":
+    if worker_class == "gevent":
+        workers = int(os.environ.get("WEB_CONCURRENCY", str(CPU_COUNT)))
+        worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+    else:
+        workers = int(os.environ.get("WEB_CONCURRENCY", str(CPU_COUNT * 2 + 1)))
+        threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+    preload_app = True
+    max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+    max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+elif SERVER_PROFILE == "dev":
+    workers = 1
+    reload = True
+else:
+    raise ValueError(f"Unknown SERVER_PROFILE: {SERVER_PROFILE}")
+
+
+def on_starting(server):  # pylint: disable=unused-argument
+    """Empty the metrics directory of any previous run."""
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR)
+
+
+def child_exit(server, worker):  # pylint: disable=unused-argument
+    """Drop the gauges of a worker that exited from the aggregated metrics."""
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    """Give the worker its own connection pool instead of the one it inherited.
+
+    With preload_app the engine is created in the master; its pooled connections
+    must not be shared across processes, so the pool is replaced without closing
+    connections the master may still own.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from app.database import Database
+
+    if Database.engine is not None:
+        Database.engine.dispose(close=False)
@@ -0,0 +1,71 @@
+"""Fixtures serving the app from an in-memory SQLite database."""
+
+from typing import Any, Callable, Iterator, List
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from app import create_app
+from app.cli.data import insert_dataset
+from app.crud.roles import role_catalog
+from app.database import Database
+from app.models import MetadataBase
+from app.routes._conditional import response_cache
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    """Create the schema in a fresh in-memory database, shared by every session."""
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+
+    @event.listens_for(engine, "connect")
+    def enable_foreign_keys(connection: Any, _: Any) -> None:
+        connection.execute("PRAGMA foreign_keys=ON")
+
+    MetadataBase.metadata.create_all(engine)
+    role_catalog.invalidate()
+    response_cache.entries.clear()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def app(engine: Engine) -> Flask:
+    """Create the app, connected to the test database."""
+    app = create_app()
+    Database.engine = engine
+    return app
+
+
+@pytest.fixture
+def client(app: Flask) -> FlaskClient:
+    """Get a client of the app."""
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(engine: Engine) -> List[str]:
+    """Record the statements executed on the test database from now on."""
+    executed: List[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(_conn: Any, _cursor: Any, statement: str, *_: Any) -> None:
+        executed.append(statement)
+
+    return executed
+
+
+@pytest.fixture
+def seed_games(app: Flask) -> Callable[[int], None]:
+    """Get a function inserting synthetic scripts and games into the test database."""
+
+    def seed(games: int) -> None:
+        insert_dataset(games, 3, games, 1000)
+
+    return seed
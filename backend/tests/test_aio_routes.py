@@ -0,0 +1,97 @@
+"""Tests of the async app's routes, served from an in-memory SQLite database."""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.aio.database import AsyncDatabase
+from app.crud import games_crud
+from app.crud.roles import role_catalog
+from app.models import MetadataBase
+
+pytest.importorskip("quart")
+pytest.importorskip("aiosqlite")
+
+
+def run_async_app(requests: Any) -> Any:
+    """Run requests against the async app, connected to a fresh database."""
+    from app.aio import create_async_app
+
+    async def run() -> Any:
+        app = create_async_app()
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def enable_foreign_keys(connection: Any, _: Any) -> None:
+            connection.execute("PRAGMA foreign_keys=ON")
+
+        async with engine.begin() as connection:
+            await connection.run_sync(MetadataBase.metadata.create_all)
+        role_catalog.invalidate()
+        AsyncDatabase.engine = engine
+        try:
+            return await requests(app.test_client())
+        finally:
+            await AsyncDatabase.close_connection()
+
+    return asyncio.run(run())
+
+
+def test_async_bulk_create_and_paged_listing() -> None:
+    games = [
+        {
+            "date": "2024-01-01",
+            "playerCount": 5 + index,
+            "scriptId": 1,
+            "winningTeam": "GOOD" if index % 2 else "EVIL",
+            "isInPerson": True,
+            "notes": None,
+            "drunkSawRoleId": None,
+        }
+        for index in range(5)
+    ]
+
+    async def requests(client: Any) -> List[Dict[str, Any]]:
+        response = await client.post(
+            "/api/roles/bulk", json=[{"name": "Imp", "team": "DEMON"}]
+        )
+        assert response.status_code == 201
+        response = await client.post("/api/scripts", json={"name": "Trouble Brewing"})
+        assert response.status_code == 201
+        response = await client.post("/api/games/bulk", json=games)
+        assert response.status_code == 201
+        assert len((await response.get_json())["result"]) == len(games)
+        response = await client.post("/api/games/999/roles", json=[])
+        assert response.status_code == 404
+
+        pages = []
+        cursor = ""
+        while cursor is not None:
+            response = await client.get(f"/api/games?limit=2&cursor={cursor}")
+            assert response.status_code == 200
+            pages.append(await response.get_json())
+            cursor = pages[-1]["nextCursor"]
+        return pages
+
+    pages = run_async_app(requests)
+    listed = [game for page in pages for game in page["result"]]
+    assert [len(page["result"]) for page in pages] == [2, 2, 1]
+    assert [game["playerCount"] for game in listed] == [
+        game["playerCount"] for game in games
+    ]
+
+
+def test_bulk_insert_copies_only_through_psycopg2(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("app.crud._base.BULK_COPY", True)
+    rows = [{"id": 1}]
+    psycopg2_engine = create_engine("postgresql+psycopg2://user@localhost/db")
+    asyncpg_engine = create_async_engine("postgresql+asyncpg://user@localhost/db")
+    assert games_crud.can_copy(psycopg2_engine, rows)
+    assert not games_crud.can_copy(asyncpg_engine.sync_engine, rows)
+    assert not games_crud.can_copy(psycopg2_engine, [{"id": None}])
@@ -0,0 +1,19 @@
+"""Tests of the OpenAPI operations the async app documents."""
+
+import pytest
+
+from app.spec import build_spec
+
+pytest.importorskip("quart")
+
+
+def test_async_listings_do_not_document_streaming() -> None:
+    from app.aio import create_async_app
+
+    paths = build_spec(create_async_app()).to_dict()["paths"]
+    for path in ("/api/games", "/api/roles", "/api/scripts"):
+        operation = paths[path]["get"]
+        names = [parameter["name"] for parameter in operation["parameters"]]
+        assert "stream" not in names
+        assert "cursor" in names
+        assert list(operation["responses"]["200"]["content"]) == ["application/json"]
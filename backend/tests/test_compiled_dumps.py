@@ -0,0 +1,70 @@
+"""Parity tests of the compiled dumps with Schema.dump."""
+
+import json
+from datetime import datetime
+from typing import Any, List
+
+import pytest
+from marshmallow import Schema
+
+from app.models import Alignment, Game, GamesRoles, Role, RoleType, Script, ScriptsRoles
+from app.schemas import GameSchema, RoleSchema, ScriptSchema, compile_dump
+
+ROLES = [
+    Role(id=index, name=f"role {index}", team=team)
+    for index, team in enumerate(RoleType, start=1)
+]
+
+
+def build_game(
+    notes: Any, drunk_saw_role_id: Any, winning_team: Alignment, roles: List[Role]
+) -> Game:
+    """Build a game mapping the given roles."""
+    game = Game(
+        id=1,
+        player_count=7,
+        date=datetime(2024, 2, 29, 21, 30),
+        is_in_person=False,
+        notes=notes,
+        winning_team=winning_team,
+        script_id=1,
+        drunk_saw_role_id=drunk_saw_role_id,
+    )
+    for index, role in enumerate(roles):
+        games_roles = GamesRoles(id=index, game_id=1, role_id=role.id)
+        games_roles.role = role
+        game.roles.append(games_roles)
+    return game
+
+
+def build_script(roles: List[Role]) -> Script:
+    """Build a script mapping the given roles."""
+    script = Script(id=1, name="Trouble Brewing")
+    for index, role in enumerate(roles):
+        scripts_roles = ScriptsRoles(id=index, script_id=1, role_id=role.id)
+        scripts_roles.role = role
+        script.roles.append(scripts_roles)
+    return script
+
+
+GAMES = [
+    build_game("Close one", 1, Alignment.GOOD, ROLES),
+    build_game(None, None, Alignment.EVIL, ROLES),
+    build_game("", None, Alignment.GOOD, []),
+    build_game(None, 2, Alignment.EVIL, ROLES[:1]),
+]
+SCRIPTS = [build_script(ROLES), build_script([])]
+
+
+@pytest.mark.parametrize(
+    ("schema", "entity"),
+    [
+        *((GameSchema(), game) for game in GAMES),
+        *((ScriptSchema(), script) for script in SCRIPTS),
+        *((RoleSchema(), role) for role in ROLES),
+    ],
+)
+def test_compiled_dump_matches_schema_dump(schema: Schema, entity: Any) -> None:
+    dump = compile_dump(schema)
+    assert dump != schema.dump, f"{type(schema).__name__} was not compiled"
+    assert json.dumps(dump(entity)) == json.dumps(schema.dump(entity))
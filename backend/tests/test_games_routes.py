@@ -0,0 +1,103 @@
+"""Tests of the game routes."""
+
+from typing import Any, Callable, Dict, List
+
+from flask.testing import FlaskClient
+
+from app.config import MAX_PAGE_SIZE
+from app.crud.roles import role_catalog
+from app.routes._conditional import response_cache
+
+
+def count_listing_statements(client: FlaskClient, statements: List[str]) -> int:
+    """List every game from a cold cache and count the statements it took."""
+    role_catalog.invalidate()
+    response_cache.entries.clear()
+    statements.clear()
+    response = client.get("/api/games")
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_list_games_statements_do_not_grow_with_games(
+    client: FlaskClient, statements: List[str], seed_games: Callable[[int], None]
+) -> None:
+    seed_games(10)
+    few = count_listing_statements(client, statements)
+    seed_games(490)
+    assert len(client.get("/api/games").get_json()["result"]) == 500
+    assert count_listing_statements(client, statements) == few
+
+
+def game_payload(index: int) -> Dict[str, Any]:
+    """Build a game to create, with some nulls and an id on every fifth."""
+    game = {
+        "playerCount": 5 + index % 11,
+        "date": "2024-01-01",
+        "isInPerson": index % 2 == 0,
+        "notes": None if index % 3 else f"game {index}",
+        "winningTeam": "GOOD" if index % 2 else "EVIL",
+        "scriptId": 1,
+        "drunkSawRoleId": None if index % 4 else 1,
+    }
+    if index % 5 == 0:
+        game["id"] = 10_000 + index
+    return game
+
+
+def test_bulk_create_games_sends_one_insert_per_chunk(
+    client: FlaskClient, statements: List[str], seed_games: Callable[[int], None]
+) -> None:
+    seed_games(1)
+    payload = [game_payload(index) for index in range(1000)]
+    statements.clear()
+    response = client.post("/api/games/bulk", json=payload)
+    assert response.status_code == 201
+    inserts = [sql for sql in statements if sql.startswith("INSERT INTO games ")]
+    # one for the games with ids, one for those without
+    assert len(inserts) == 2
+
+    created = response.get_json()["result"]
+    assert [game["notes"] for game in created] == [game["notes"] for game in payload]
+    assert [game["drunkSawRoleId"] for game in created] == [
+        game["drunkSawRoleId"] for game in payload
+    ]
+    assert all(
+        created_game["id"] == game["id"]
+        for created_game, game in zip(created, payload)
+        if "id" in game
+    )
+
+
+def test_set_game_roles_reads_the_game_once(
+    client: FlaskClient, statements: List[str], seed_games: Callable[[int], None]
+) -> None:
+    seed_games(1)
+    roles = client.get("/api/roles").get_json()["result"][:3]
+    statements.clear()
+    response = client.post(
+        "/api/games/1/roles", json=[{"name": role["name"]} for role in roles]
+    )
+    assert response.status_code == 200
+    assert [role["id"] for role in response.get_json()["roles"]] == [
+        role["id"] for role in roles
+    ]
+    game_reads = [
+        sql for sql in statements if sql.startswith("SELECT games.player_count")
+    ]
+    assert len(game_reads) == 1
+    assert client.post("/api/games/999/roles", json=[]).status_code == 404
+
+
+def test_list_games_pages_by_default_but_streams_everything(
+    client: FlaskClient, seed_games: Callable[[int], None]
+) -> None:
+    seed_games(MAX_PAGE_SIZE + 1)
+    page = client.get("/api/games").get_json()
+    assert len(page["result"]) == MAX_PAGE_SIZE
+    rest = client.get(f"/api/games?cursor={page['nextCursor']}").get_json()
+    assert len(rest["result"]) == 1
+    assert rest["nextCursor"] is None
+
+    response = client.get("/api/games?stream=true")
+    assert len(response.get_data(as_text=True).splitlines()) == MAX_PAGE_SIZE + 1
@@ -0,0 +1,42 @@
+"""Tests of the request metrics."""
+
+from typing import Callable, Optional
+
+import pytest
+from flask.testing import FlaskClient
+
+from app.utils import metrics
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+
+def rejections(route: str, error: str) -> float:
+    """Get the rejections of POST requests to a route counted so far."""
+    value: Optional[float] = prometheus_client.REGISTRY.get_sample_value(
+        "botc_http_request_errors_total",
+        {"method": "POST", "route": route, "error": error},
+    )
+    return value or 0.0
+
+
+def test_rejected_requests_are_counted_once(
+    client: FlaskClient, seed_games: Callable[[int], None]
+) -> None:
+    seed_games(1)
+    assert metrics.metrics
+    route = "/api/games/<game_id>/roles"
+    invalid = rejections(route, "ValidationError")
+    integrity = rejections(route, "BotCIntegrityError")
+
+    response = client.post("/api/games/1/roles", json=[{"name": 1}])
+    assert response.status_code == 400
+    assert isinstance(response.json, dict)
+    assert "name" in response.json["0"]
+    response = client.post("/api/games/1/roles", json=[{"name": "Nobody"}])
+    assert response.status_code == 400
+    assert response.json == {"Role name": "Invalid name: Nobody"}
+    # an integrity error answered as not found is not a rejection
+    assert client.post("/api/games/999/roles", json=[]).status_code == 404
+
+    assert rejections(route, "ValidationError") == invalid + 1
+    assert rejections(route, "BotCIntegrityError") == integrity + 1
@@ -0,0 +1,34 @@
+"""Tests of the migrations that rewrite existing data."""
+
+from typing import Callable
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.crud import stats_crud, versions_crud
+from app.models import GamesRoles, MetadataBase
+from benchmarks.indexes import migrate, schema_before_migration
+
+
+def test_deduplicating_game_roles_recounts_role_stats(
+    engine: Engine, seed_games: Callable[[int], None]
+) -> None:
+    MetadataBase.metadata.drop_all(engine)
+    schema_before_migration().create_all(engine)
+    seed_games(10)
+    with Session(engine) as session:
+        mappings = session.execute(select(GamesRoles.game_id, GamesRoles.role_id))
+        duplicates = [{"game_id": row[0], "role_id": row[1]} for row in mappings]
+        session.execute(insert(GamesRoles), duplicates)
+        # the counters counted the duplicates, as the writes before the migration did
+        stats_crud.rebuild(session)
+        version = versions_crud.get_versions(session, ["games"])["games"].version
+
+    migrate(engine)
+
+    with Session(engine) as session:
+        assert session.scalar(select(func.count(GamesRoles.id))) == len(duplicates)
+        assert stats_crud.check(session) == []
+        versions = versions_crud.get_versions(session, ["games"])
+        assert versions["games"].version == version + 1
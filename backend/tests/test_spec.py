@@ -0,0 +1,30 @@
+"""Tests of the API spec and the Swagger UI served from flasgger's files."""
+
+import re
+
+from flask.testing import FlaskClient
+
+from app.spec import SWAGGER_CONFIG
+
+
+def test_swagger_ui_loads_with_its_assets(client: FlaskClient) -> None:
+    response = client.get(SWAGGER_CONFIG["specs_route"])
+    assert response.status_code == 200
+    page = response.get_data(as_text=True)
+    assert "/apispec.json" in page
+    assets = set(re.findall(r'(?:src|href)="(/[^"]+)"', page))
+    assert any(asset.endswith("swagger-ui-bundle.js") for asset in assets)
+    for asset in assets:
+        assert client.get(asset).status_code == 200, asset
+
+    response = client.get("/apidocs/index.html")
+    assert response.status_code == 302
+    assert response.location == SWAGGER_CONFIG["specs_route"]
+    assert client.get("/oauth2-redirect.html").status_code == 200
+
+
+def test_spec_documents_the_routes(client: FlaskClient) -> None:
+    spec = client.get("/apispec.json").json
+    assert isinstance(spec, dict)
+    assert spec["openapi"].startswith("3.")
+    assert {"/api/games", "/api/roles", "/api/scripts"} <= set(spec["paths"])
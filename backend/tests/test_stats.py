@@ -0,0 +1,68 @@
+"""Tests of the counter tables kept by the game writes."""
+
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.crud import games_crud, games_roles_crud, stats_crud
+from app.crud.stats import GAME_KEYS
+from app.models import Alignment, Game, GameStats
+
+GAME_FIELDS = (*GAME_KEYS, "date", "notes", "drunk_saw_role_id")
+
+
+def game_json(session: Session, game_id: int, **changes: Any) -> Dict[str, Any]:
+    """Get the loaded game schema of a game as the session holds it, with changes."""
+    game = session.get(Game, game_id)
+    return {**{name: getattr(game, name) for name in GAME_FIELDS}, **changes}
+
+
+def test_write_rereads_game_changed_since_it_was_loaded(
+    engine: Engine, seed_games: Callable[[int], None]
+) -> None:
+    seed_games(2)
+    with Session(engine, expire_on_commit=False) as stale, Session(engine) as other:
+        # the stale session holds the game as it was before the other write
+        game = games_crud.get_entity(stale, 1)
+        games_crud.get_entity(stale, 2)
+        stale.commit()
+        changed = (
+            Alignment.EVIL if game.winning_team == Alignment.GOOD else Alignment.GOOD
+        )
+        games_crud.update_entity(other, game_json(other, 1, winning_team=changed), 1)
+        games_roles_crud.create_entities_for_game(other, [{"name": "Drunk"}], 1)
+
+        # the client sends the whole game, as it is after the other write
+        games_crud.update_entity(stale, game_json(other, 1, player_count=15), 1)
+        games_roles_crud.create_entities_for_game(
+            stale, [{"name": "Minion 1"}, {"name": "Demon 1"}], 1
+        )
+        games_roles_crud.create_entities_for_game(other, [], 2)
+        games_crud.update_entity(other, game_json(other, 2, player_count=5), 2)
+        games_crud.delete_entity(stale, 2)
+        assert stats_crud.check(stale) == []
+
+
+def test_counters_are_upserted_in_key_order(
+    engine: Engine, seed_games: Callable[[int], None]
+) -> None:
+    seed_games(1)
+    upserted: List[Any] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(_conn: Any, _cursor: Any, statement: str, parameters: Any, *_: Any):
+        if statement.startswith(f"INSERT INTO {GameStats.__tablename__}"):
+            upserted.append(parameters)
+
+    with Session(engine) as session:
+        for player_count in (15, 5):
+            games_crud.update_entity(
+                session, game_json(session, 1, player_count=player_count), 1
+            )
+    # each update takes the game out of one counter and adds it to another, the
+    # player count being the second of the five parameters of a row
+    for parameters in upserted:
+        assert parameters[1::5] == tuple(sorted(parameters[1::5]))
+    assert len(upserted) == 2
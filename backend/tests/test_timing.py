@@ -0,0 +1,66 @@
+"""Tests of the per-request statement checks."""
+
+from typing import Callable
+
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.exceptions import NPlusOneError
+from app.models import Game
+from app.utils import timing
+
+
+@pytest.fixture(autouse=True)
+def raise_on_n_plus_one(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail on N+1 queries, as the detector is meant to in tests."""
+    monkeypatch.setattr(timing, "N_PLUS_ONE_RAISE", True)
+
+
+def test_repeated_statement_raises(engine: Engine) -> None:
+    timing.start_timings("GET /test")
+    try:
+        with Session(engine) as session:
+            for game_id in range(timing.N_PLUS_ONE_THRESHOLD):
+                session.scalars(select(Game).where(Game.id == game_id)).all()
+            with pytest.raises(NPlusOneError):
+                session.scalars(select(Game).where(Game.id == 0)).all()
+    finally:
+        timing.end_timings()
+
+
+def test_bulk_insert_chunks_are_not_n_plus_one(
+    client: FlaskClient,
+    seed_games: Callable[[int], None],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    seed_games(1)
+    monkeypatch.setattr("app.crud._base.BULK_CHUNK_SIZE", 1)
+    payload = [
+        {
+            "playerCount": 7,
+            "date": "2024-01-01",
+            "isInPerson": True,
+            "notes": None,
+            "winningTeam": "GOOD",
+            "scriptId": 1,
+            "drunkSawRoleId": None,
+        }
+        for _ in range(100)
+    ]
+    response = client.post("/api/games/bulk", json=payload)
+    assert response.status_code == 201
+    assert len(response.get_json()["result"]) == 100
+
+
+def test_statements_after_a_request_are_not_attributed_to_it(
+    client: FlaskClient, engine: Engine, seed_games: Callable[[int], None]
+) -> None:
+    seed_games(1)
+    assert client.get("/api/games").status_code == 200
+    assert timing.current_timings.get() is None
+    with Session(engine) as session:
+        for _ in range(timing.N_PLUS_ONE_THRESHOLD + 1):
+            session.scalars(select(Game)).all()
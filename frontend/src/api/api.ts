@@ -1,25 +1,31 @@
 import axios from "axios";
 import { Game, Script, Role } from "types";
 
+const getAllPages = async <T>(url: string): Promise<T[]> => {
+  const result: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const config = {
+      headers: { Accept: "application/json" },
+      params: cursor ? { cursor } : {},
+    };
+    const response = await axios.get(url, config);
+    result.push(...response.data.result);
+    cursor = response.data.nextCursor;
+  } while (cursor);
+  return result;
+};
+
 export const getGames = async (): Promise<Game[]> => {
-  const url = "/api/games";
-  const config = { headers: { Accept: "application/json" } };
-  const response = await axios.get(url, config);
-  return response.data.result;
+  return getAllPages<Game>("/api/games");
 };
 
 export const getScripts = async (): Promise<Script[]> => {
-  const url = "/api/scripts";
-  const config = { headers: { Accept: "application/json" } };
-  const response = await axios.get(url, config);
-  return response.data.result;
+  return getAllPages<Script>("/api/scripts");
 };
 
 export const getRoles = async (): Promise<Role[]> => {
-  const url = "/api/roles";
-  const config = { headers: { Accept: "application/json" } };
-  const response = await axios.get(url, config);
-  return response.data.result;
+  return getAllPages<Role>("/api/roles");
 };
 
 export const createGame = async (game: Game): Promise<Game> => {